@@ -1,3 +1,4 @@
+import array
 import re
 
 import interpret.Buffer as buffer
@@ -15,6 +16,82 @@ DFA = 'DFA'
 NFA = 'NFA'
 DTM = 'DTM'
 FUNCTION_CALL = 'FUNCTION_CALL'
+WHITESPACE = 'WHITESPACE'
+
+# A quoted string, in which a backslash escapes the quote it started with
+STRING_PATTERN = r"(?P<quote>[\"\'])(?:\\(?P=quote)|(?!(?P=quote)).)*(?P=quote)"
+
+# One alternation, tried in order, standing in for the old chain of
+# _process_* methods. Keywords leave their '(' to be lexed as a LITERAL.
+TOKEN_REGEX = re.compile('|'.join(
+    '(?P<{}>{})'.format(name, pattern) for name, pattern in [
+        (WHITESPACE, r"[^\S\r\n]+"),
+        (EOL, r"\n"),
+        (PRINT, r"print(?=\()"),
+        (DFA, r"DFA(?=\()"),
+        (NFA, r"NFA(?=\()"),
+        (DTM, r"DTM(?=\()"),
+        (FUNCTION_CALL, r"(?:open|save|test|definition|accepts_all|limit)(?=\()"),
+        (BOOLEAN, r"(?:True|False)\b"),
+        (VAR, r"[a-zA-Z_]+"),
+        (STRING, STRING_PATTERN),
+        (INTEGER, r"\d+"),
+        (LITERAL, r"."),
+    ]
+))
+
+
+def _make_token(match, position=None):
+    if match.lastgroup == INTEGER:
+        return token.Token(INTEGER, int(match.group()), position)
+
+    return token.Token(match.lastgroup, match.group(), position)
+
+
+def tokenize(text, line=0, column=0):
+    """ Scans `text` in a single pass starting at (`line`, `column`),
+    yielding the same tokens as repeated calls to Lexer.get_token """
+    for t, _, _ in _scan(text, line, column):
+        yield t
+
+
+def _scan(text, line=0, column=0):
+    """ Yields each token with the (line, column) the buffer would be at
+    after reading it """
+    lines = text.split('\n') if text else []
+    if line >= len(lines):
+        yield token.Token(EOF), line, column
+        return
+
+    pos = sum(len(l) + 1 for l in lines[:line]) + column
+    end = len(text)
+    line_start = pos - column
+    match_at = TOKEN_REGEX.match
+
+    while True:
+        if pos == end:
+            yield token.Token(EOL, position=[line + 1, 0]), line + 1, 0
+            yield token.Token(EOF), line + 1, 0
+            return
+
+        match = match_at(text, pos)
+        if match.lastgroup == WHITESPACE:
+            pos = match.end()
+            match = match_at(text, pos)
+            if match is None or match.lastgroup == EOL:
+                raise buffer.EOLError(
+                    "EOL reading column {} at line {}".format(
+                        pos - line_start + 1, line + 1
+                    )
+                )
+
+        pos = match.end()
+        if match.lastgroup == EOL:
+            line += 1
+            line_start = pos
+            yield token.Token(EOL, position=[line, 0]), line, 0
+        else:
+            yield _make_token(match), line, pos - line_start
 
 class TokenError(ValueError):
     """ The expected token cannot be found """
@@ -34,25 +111,68 @@ class UnknownError(SyntaxError):
         self.msg = msg
         super().__init__(self.msg)
 class Lexer:
-    def __init__(self, text=''):
-        self._text_storage = buffer.Buffer(text)
+    def __init__(self, text='', pretokenize=True):
+        self._pretokenize = pretokenize
+        self._text_storage = buffer.Buffer()
         self._status = []
         self._current_token = None
-        
+        self.load(text)
+
     def __enter__(self):
         self.stash()
 
     def __exit__(self, etype, evalue, etrace):
         if etype:
             self.pop()
+        else:
+            # Keep what was parsed and drop the saved state, so an enclosing
+            # block rolls back to its own start
+            self._status.pop()
 
         if etype in [TokenError, SyntaxError]:
             return True
 
-    def load(self, text):
+    def load(self, text, first_line=1):
+        """ Loads `text`; `first_line` is the source line it starts on, so
+        errors in a statement read from the middle of a file point at it """
         self._text_storage.load(text)
+        self._line_offset = first_line - 1
+        if self._pretokenize:
+            self._load_tokens(text)
+
+    def _load_tokens(self, text):
+        """ Lexes `text` once into flat arrays so that get_token, peek_token,
+        stash and pop are index operations on a cursor """
+        self._tokens = []
+        self._token_lines = array.array('L')
+        self._token_columns = array.array('L')
+        self._token_error = None
+        self._cursor = 0
+
+        try:
+            for t, line, column in _scan(text):
+                self._tokens.append(t)
+                self._token_lines.append(line)
+                self._token_columns.append(column)
+        except buffer.EOLError as ex:
+            # Surfaced when the cursor reaches it, like the incremental lexer
+            self._token_error = ex
+
+    def _next_token(self):
+        if self._cursor == len(self._tokens):
+            if self._token_error:
+                raise self._token_error
+            # Keep returning EOF once the end has been reached
+            self._cursor -= 1
+
+        self._current_token = self._tokens[self._cursor]
+        self._cursor += 1
+        return self._current_token
 
     def get_token(self):
+        if self._pretokenize:
+            return self._next_token()
+
         eof = self._process_eof()
         if eof:
             return eof
@@ -60,65 +180,46 @@ class Lexer:
         eol = self._process_eol()
         if eol:
             return eol
-          
-        self._process_whitespace()
-        
-        print = self._process_print()
-        if print:
-            return print
-        
-        dfa = self._process_dfa()
-        if dfa:
-            return dfa
-        
-        nfa = self._process_nfa()
-        if nfa:
-            return nfa
-        
-        dtm = self._process_dtm()
-        if dtm:
-            return dtm
-        
-        func_name = self._process_func_name()
-        if func_name:
-            return func_name
 
-        boolean = self._process_boolean()
-        if boolean:
-            return boolean
-        
-        var = self._process_var()
-        if var:
-            return var
-        
-        string = self._process_string()
-        if string:
-            return string
-        
-        number = self._process_number()
-        if number:
-            return number
-        
-        literal = self._process_literal()
-        if literal:
-            return literal
+        match = self._match_token()
+        if match.lastgroup == WHITESPACE:
+            self._text_storage.skip(match.end() - match.start())
+            match = self._match_token()
 
-    def get_tokens(self):
-        t = self.get_token()
-        tokens = []
+        if match is None:
+            # Whitespace ran up to the end of the line
+            raise buffer.EOLError(
+                "EOL reading column {} at line {}".format(
+                    self._text_storage.column + 1, self._text_storage.line + 1
+                )
+            )
 
-        while t != token.Token('EOF'):
-            tokens.append(t)
-            t = self.get_token()
+        return self._set_current_token_and_skip(
+            _make_token(match), match.end() - match.start()
+        )
 
-        tokens.append(token.Token('EOF'))
+    def get_tokens(self):
+        if self._pretokenize:
+            tokens = [self._next_token()]
+            while tokens[-1].type != EOF:
+                tokens.append(self._next_token())
+            return tokens
+
+        tokens = list(tokenize(
+            self._text_storage.text, *self._text_storage.position
+        ))
+        self._text_storage.goto(len(self._text_storage.lines))
+        self._current_token = tokens[-1]
 
         return tokens
     
     @property
     def _current_status(self):
         status = {}
-        status['text_storage'] = self._text_storage.position
+        if self._pretokenize:
+            status['cursor'] = self._cursor
+        else:
+            status['text_storage'] = self._text_storage.position
         status['current_token'] = self._current_token
         return status
 
@@ -127,10 +228,16 @@ class Lexer:
 
     def pop(self):
         status = self._status.pop()
-        self._text_storage.goto(*status['text_storage'])
+        if self._pretokenize:
+            self._cursor = status['cursor']
+        else:
+            self._text_storage.goto(*status['text_storage'])
         self._current_token = status['current_token']
     
     def peek_token(self, amount=1):
+        if self._pretokenize and self._cursor + amount <= len(self._tokens):
+            return self._tokens[self._cursor + amount - 1]
+
         self.stash()
         for i in range(amount):
             token = self.get_token()
@@ -140,10 +247,16 @@ class Lexer:
      
     @property
     def line(self):
-        return self._text_storage.line + 1
+        if self._pretokenize:
+            line = self._token_lines[self._cursor - 1] if self._cursor else 0
+        else:
+            line = self._text_storage.line
+        return line + 1 + self._line_offset
     
     @property
     def column(self):
+        if self._pretokenize:
+            return self._token_columns[self._cursor - 1] + 1 if self._cursor else 1
         return self._text_storage.column + 1
     
     @property
@@ -154,8 +267,13 @@ class Lexer:
     def _current_line(self):
         return self._text_storage.current_line
 
-    def _set_current_token_and_skip(self, token):
-        self._text_storage.skip(len(token))
+    def _match_token(self):
+        return TOKEN_REGEX.match(
+            self._current_line, self._text_storage.column
+        )
+
+    def _set_current_token_and_skip(self, token, length=None):
+        self._text_storage.skip(len(token) if length is None else length)
 
         self._current_token = token
         return token
@@ -180,190 +298,6 @@ class Lexer:
                 token.Token(EOF)
             )
             
-    def _process_whitespace(self):
-        regexp = re.compile(r"[^\S\r\n]+")
-
-        match = regexp.match(
-            self._text_storage.tail
-        )
-
-        if not match:
-            return None
-
-        self._text_storage.skip(len(match.group()))
-        
-    def _process_print(self):
-        regexp = re.compile(r"\b(print\()")
-        
-        match = regexp.match(
-            self._text_storage.tail
-        )
-
-        if not match:
-            return None
-
-        token_string = match.group()[:-1]
-
-        return self._set_current_token_and_skip(
-            token.Token(PRINT, token_string)
-        ) 
-        
-    def _process_dfa(self):
-        regexp = re.compile(r"\b(DFA\()")
-        
-        match = regexp.match(
-            self._text_storage.tail
-        )
-
-        if not match:
-            return None
-
-        token_string = match.group()[:-1]
-
-        return self._set_current_token_and_skip(
-            token.Token(DFA, token_string)
-        )
-        
-    def _process_nfa(self):
-        regexp = re.compile(r"\b(NFA\()")
-        
-        match = regexp.match(
-            self._text_storage.tail
-        )
-
-        if not match:
-            return None
-
-        token_string = match.group()[:-1]
-
-        return self._set_current_token_and_skip(
-            token.Token(NFA, token_string)
-        )
-        
-    def _process_dtm(self):
-        regexp = re.compile(r"\b(DTM\()")
-        
-        match = regexp.match(
-            self._text_storage.tail
-        )
-
-        if not match:
-            return None
-
-        token_string = match.group()[:-1]
-
-        return self._set_current_token_and_skip(
-            token.Token(DTM, token_string)
-        )
-        
-    def _process_func_name(self):
-        matches = self.func_names() 
-
-        for i in matches:
-            if i:         
-                token_string = i.group()[:-1]
-
-                return self._set_current_token_and_skip(
-                    token.Token(FUNCTION_CALL, token_string)
-                )
-                
-        return None
-    
-    def func_names(self, matches=None):
-        if matches == None:
-            matches = [] 
-           
-        regexp = re.compile(r"\b(open\()")
-        matches.append(regexp.match(
-            self._text_storage.tail
-        ))
-        
-        regexp = re.compile(r"\b(save\()")
-        matches.append(regexp.match(
-            self._text_storage.tail
-        ))
-        
-        regexp = re.compile(r"\b(test\()")
-        matches.append(regexp.match(
-            self._text_storage.tail
-        ))
-        
-        regexp = re.compile(r"\b(definition\()")
-        matches.append(regexp.match(
-            self._text_storage.tail
-        ))
-        
-        return matches
-        
-    def _process_boolean(self):
-        regexp = re.compile(r"\b(True|False)\b")
-
-        match = regexp.match(
-            self._text_storage.tail
-        )
-
-        if not match:
-            return None
-
-        token_string = match.group()
-
-        return self._set_current_token_and_skip(
-            token.Token(BOOLEAN, token_string)
-        ) 
-
-    def _process_number(self):
-        regexp = re.compile('\d+')
-
-        match = regexp.match(
-            self._text_storage.tail
-        )
-
-        if not match:
-            return None
-
-        token_string = match.group()
-
-        return self._set_current_token_and_skip(
-            token.Token(INTEGER, int(token_string))
-        ) 
-    
-    def _process_string(self):
-        regexp = re.compile(r"([\"\'])((?:\\\1|(?:(?!\1)).)*)(\1)")
-
-        match = regexp.match(
-            self._text_storage.tail
-        )
-
-        if not match:
-            return None
-
-        token_string = match.group()
-
-        return self._set_current_token_and_skip(
-            token.Token(STRING, token_string)
-        )
-        
-    def _process_var(self):
-        regexp = re.compile('[a-zA-Z_]+')
-        
-        match = regexp.match(
-            self._text_storage.tail
-        )
-        
-        if not match:
-            return None
-        
-        token_string = match.group()
-        
-        return self._set_current_token_and_skip(
-            token.Token(VAR, str(token_string))
-        )
-        
-    def _process_literal(self):
-        return self._set_current_token_and_skip(
-            token.Token(LITERAL, self._current_char)
-        )
-        
     def discard(self, token):
         if self.get_token() != token:
             raise TokenError(
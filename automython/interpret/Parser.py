@@ -2,10 +2,13 @@ import interpret.Lexer as fa_lex
 import interpret.Token as token
 
 class Node:
+    __slots__ = ()
+
     def asdict(self):
         return {}  # pragma: no cover
     
 class PrintNode(Node):
+    __slots__ = ('variable', 'value')
     node_type = 'print_func'
 
     def __init__(self, variable, value):
@@ -20,6 +23,7 @@ class PrintNode(Node):
         }
  
 class BinaryNode(Node):
+    __slots__ = ('left', 'operator', 'right')
     node_type = 'binary'
 
     def __init__(self, left, operator, right):
@@ -44,6 +48,7 @@ class BinaryNode(Node):
         return result
     
 class AssignmentNode(Node):
+    __slots__ = ('variable', 'value')
     node_type = 'assignment'
 
     def __init__(self, variable, value):
@@ -58,6 +63,7 @@ class AssignmentNode(Node):
         }
         
 class FunctionCallNode(Node):
+    __slots__ = ('variable', 'func_name', 'parameters')
     node_type = 'function_call'
 
     def __init__(self, variable, func_name, parameters):
@@ -74,6 +80,7 @@ class FunctionCallNode(Node):
         }
         
 class ValueNode(Node):
+    __slots__ = ('value',)
     node_type = 'value_node'
 
     def __init__(self, value):
@@ -86,15 +93,18 @@ class ValueNode(Node):
         }
 
 class LiteralNode(ValueNode):
+    __slots__ = ()
     node_type = 'literal'
     
 class IntegerNode(ValueNode):
+    __slots__ = ()
     node_type = 'integer'
 
     def __init__(self, value):
         self.value = int(value)
         
 class BooleanNode(ValueNode):
+    __slots__ = ()
     node_type = 'boolean'
     
     def __init__(self, value):
@@ -105,15 +115,18 @@ class BooleanNode(ValueNode):
             
     
 class VariableNode(ValueNode):
+    __slots__ = ()
     node_type = 'variable'
     
 class StringNode(ValueNode):
+    __slots__ = ()
     node_type = 'string'
 
     def __init__(self, value):
         self.value = str(value)
     
 class DictionaryNode(ValueNode):
+    __slots__ = ('key',)
     node_type = 'dictionary'
     
     def __init__(self, dict):
@@ -127,94 +140,45 @@ class DictionaryNode(ValueNode):
         }
         
 class CollectionNode(ValueNode):
+    """ Holds its element nodes in `value`; the visitor walks them directly,
+    so asdict() is only built on request """
+    __slots__ = ()
     node_type = 'collection'
     
     def __init__(self, list):
         self.value = list
-        self.elements = []
-        for element in self.value:
-            self.elements.append(element.asdict())
         
     def asdict(self):
         return {
             'type': self.node_type,
-            'value': self.elements
+            'value': [element.asdict() for element in self.value]
         }
         
-class TupleNode(ValueNode):
+class TupleNode(CollectionNode):
+    __slots__ = ()
     node_type = 'tuple'
-    
-    def __init__(self, list):
-        self.value = list
-        self.elements = []
-        for element in self.value:
-            self.elements.append(element.asdict())
         
     def asdict(self):
         return {
             'type': self.node_type,
-            'value': tuple(self.elements)
+            'value': tuple(element.asdict() for element in self.value)
         }
 
-class ParametersNode(ValueNode):
+class ParametersNode(CollectionNode):
+    __slots__ = ()
     node_type = 'parameters'
-    
-    def __init__(self, list):
-        self.value = list
-        self.elements = []
-        for element in self.value:
-            self.elements.append(element.asdict())
-        
-    def asdict(self):
-        return {
-            'type': self.node_type,
-            'value': self.elements
-        }
 
-class DFANode(ValueNode):
+class DFANode(CollectionNode):
+    __slots__ = ()
     node_type = 'dfa'
-    
-    def __init__(self, list):
-        self.value = list
-        self.elements = []
-        for element in self.value:
-            self.elements.append(element.asdict())
         
-    def asdict(self):
-        return {
-            'type': self.node_type,
-            'value': self.elements
-        }
-        
-class NFANode(ValueNode):
+class NFANode(CollectionNode):
+    __slots__ = ()
     node_type = 'nfa'
-    
-    def __init__(self, list):
-        self.value = list
-        self.elements = []
-        for element in self.value:
-            self.elements.append(element.asdict())
         
-    def asdict(self):
-        return {
-            'type': self.node_type,
-            'value': self.elements
-        }
-        
-class DTMNode(ValueNode):
+class DTMNode(CollectionNode):
+    __slots__ = ()
     node_type = 'dtm'
-    
-    def __init__(self, list):
-        self.value = list
-        self.elements = []
-        for element in self.value:
-            self.elements.append(element.asdict())
-        
-    def asdict(self):
-        return {
-            'type': self.node_type,
-            'value': self.elements
-        }
         
 class Parser:
 
@@ -238,46 +202,43 @@ class Parser:
                     t.value, self.lexer.line
                 )
             )
-       
-        return_node = None 
-        with self.lexer:
-            self._parse_literal(['('])
-            node = PrintNode("print_func", self.parse_standalone_func())
-            self._parse_literal([')'])
-            return_node = node
-            
-        with self.lexer:
-            self._parse_literal(['('])
-            node = PrintNode("print_func", self.parse_function())
-            self._parse_literal([')'])
-            return_node = node
-            
-        with self.lexer: 
-            self._parse_literal(['('])
-            node = PrintNode("print_func", self.parse_collection())
-            self._parse_literal([')'])
-            return_node = node
-            
-        with self.lexer: 
-            self._parse_literal(['('])
-            node = PrintNode("print_func", self.parse_expression())
-            self._parse_literal([')'])
-            return_node = node
-        
-        with self.lexer:
+
+        if self._is_literal(self.lexer.peek_token(2), ')'):
             self._parse_literal(['('])
             self._parse_literal([')'])
-            node = PrintNode("print_func", ParametersNode([]))
-            return_node = node
-            
-        if not return_node:
-            exception = fa_lex.SyntaxError(
-                'Incorrect syntax for print() call at line {}'.format(
-                    self.lexer.line
-                )
+            return PrintNode("print_func", ParametersNode([]))
+
+        for parse_argument in self._print_argument_productions():
+            with self.lexer:
+                self._parse_literal(['('])
+                node = PrintNode("print_func", parse_argument())
+                self._parse_literal([')'])
+                return node
+
+        raise fa_lex.SyntaxError(
+            'Incorrect syntax for print() call at line {}'.format(
+                self.lexer.line
             )
-            return exception
-        return return_node
+        )
+
+    def _print_argument_productions(self):
+        # The lexer sits on the '(' of print(, so the argument starts at 2
+        t = self.lexer.peek_token(2)
+
+        if t.type == fa_lex.FUNCTION_CALL:
+            return [self.parse_standalone_func]
+        elif t.type == fa_lex.VAR and self._is_literal(self.lexer.peek_token(3), '.'):
+            return [self.parse_function]
+        elif self._is_literal(t, '{'):
+            return [self.parse_collection]
+        elif self._is_literal(t, '('):
+            # Either a tuple, or a parenthesised expression such as (1)+2
+            return [self.parse_collection, self.parse_expression]
+        else:
+            return [self.parse_expression]
+
+    def _is_literal(self, t, value):
+        return t.type == fa_lex.LITERAL and t.value == value
     
     def parse_string(self):
         t = self.lexer.get_token()
@@ -334,6 +295,13 @@ class Parser:
         self.lexer.discard(token.Token(fa_lex.LITERAL, '='))
        
         t = self.lexer.peek_token()
+        if t.type in (fa_lex.EOL, fa_lex.EOF):
+            # Nothing follows '=' on its line
+            raise fa_lex.SyntaxError(
+                'Assignment has undefined value at line {}'.format(
+                    self.lexer.line
+                )
+            )
         func_t = self.lexer.peek_token(2)
         if func_t.type == fa_lex.LITERAL and func_t.value == '.':
             value = self.parse_function()
@@ -346,10 +314,10 @@ class Parser:
         else:
             value = self.parse_expression()
             
-        if not value or t == token.Token(fa_lex.EOL) or t == token.Token(fa_lex.EOF):
+        if not value:
             raise fa_lex.SyntaxError(
                 'Assignment has undefined value at line {}'.format(
-                    t.value, self.lexer.line
+                    self.lexer.line
                 )
             )
            
@@ -487,24 +455,28 @@ class Parser:
                 
         return left 
     
-    def parse_tuple(self, collection=None):
+    def parse_tuple(self):
         with self.lexer:
             self._parse_literal(['('])
-            left = self.parse_expression()
-            if collection == None:
-                collection = []
-            collection.append(left)
+            collection = [self._parse_tuple_element()]
             self._parse_literal([','])
             self._allow_whitespace()
-            collection = self.parse_tuple(collection)
+            collection.append(self._parse_tuple_element())
+            self._parse_remaining(collection, self._parse_tuple_element)
             self._parse_literal([')'])
             return collection
         
         left = self.parse_expression() 
         return left
+
+    def _parse_tuple_element(self):
+        element = self.parse_tuple()
+        if type(element) == list:
+            return TupleNode(element)
+        return element
     
     def parse_dictionary(self):
-        key = self.parse_tuple()
+        key = self._parse_tuple_element()
         
         with self.lexer:
             self.lexer.discard(token.Token(fa_lex.LITERAL, ':'))
@@ -514,25 +486,30 @@ class Parser:
             else:
                 value = self.parse_expression() 
                 
-            if type(key) == list:
-                key = DictionaryNode((TupleNode(key), value)) 
-            else:
-                key = DictionaryNode((key, value))
+            key = DictionaryNode((key, value))
             
         return key
+
+    def _parse_remaining(self, collection, parse_element):
+        """ Appends each further `, element` to `collection` in place,
+        stopping before the first comma that is not followed by one """
+        parsed = True
+        while parsed:
+            parsed = False
+            with self.lexer:
+                self._parse_literal([','])
+                self._allow_whitespace()
+                collection.append(parse_element())
+                parsed = True
+
+        return collection
          
     def parse_elements(self, collection=None):
-        left = self.parse_dictionary() 
         if collection == None:
             collection = []     
-        collection.append(left)
+        collection.append(self.parse_dictionary())
         
-        with self.lexer:
-            self._parse_literal([','])
-            self._allow_whitespace() 
-            collection = self.parse_elements(collection)
-           
-        return collection
+        return self._parse_remaining(collection, self.parse_dictionary)
     
     def parse_collection(self):
         t = self.lexer.peek_token()
@@ -561,21 +538,17 @@ class Parser:
             )
        
     def parse_parameters(self, parameters=None):
-        t = self.lexer.peek_token()
-        if t.type == fa_lex.LITERAL and (t.value == '{' or t.value == '('):
-            left = self.parse_collection()
-        else:
-            left = self.parse_expression()
         if parameters == None:
             parameters = []     
-        parameters.append(left)
-        
-        with self.lexer:
-            self._parse_literal([','])
-            self._allow_whitespace() 
-            parameters = self.parse_parameters(parameters)
-           
-        return parameters   
+        parameters.append(self._parse_parameter())
+
+        return self._parse_remaining(parameters, self._parse_parameter)
+
+    def _parse_parameter(self):
+        t = self.lexer.peek_token()
+        if t.type == fa_lex.LITERAL and (t.value == '{' or t.value == '('):
+            return self.parse_collection()
+        return self.parse_expression()
         
     def parse_fa(self):
         t = self.lexer.get_token() 
@@ -624,35 +597,24 @@ class Parser:
                 return DTMNode(parameters) 
             
     def parse_line(self):
-        node = None
-        
-        with self.lexer:
+        t = self.lexer.peek_token()
+
+        if t.type == fa_lex.FUNCTION_CALL:
             node = self.parse_standalone_func()
-            
-        with self.lexer:
+        elif t.type == fa_lex.PRINT:
             node = self.parse_print()
-        
-        with self.lexer:
+        elif t.type == fa_lex.VAR and self._is_literal(self.lexer.peek_token(2), '='):
             node = self.parse_assignment()
-            
-        if isinstance(node, fa_lex.TokenError) \
-            or isinstance(node, fa_lex.SyntaxError):
-            raise node
-            
-        with self.lexer:
+        elif t.type == fa_lex.VAR and self._is_literal(self.lexer.peek_token(2), '.'):
             node = self.parse_function()
-            
-        with self.lexer:
-            node = self.parse_expression()
-            
-        if isinstance(node, fa_lex.TokenError) \
-            or isinstance(node, fa_lex.SyntaxError):
-            raise node
-        elif node:
-            return node
         else:
-            raise fa_lex.UnknownError(
-                'line {}, the parsed node returned None'.format(
-                    self.lexer.line
+            node = self.parse_expression()
+
+        if not node:
+            raise fa_lex.SyntaxError(
+                'Unexpected value \'{}\' at line {}'.format(
+                    t.value, self.lexer.line
                 )
-            )
\ No newline at end of file
+            )
+
+        return node
@@ -1,5 +1,5 @@
 import interpret.helpers as helpers
-import pandas as pd
+import interpret.Parser as fa_parse
 
 class Visitor:
   def __init__(self):
@@ -10,21 +10,26 @@ class Visitor:
       self.DTMs = {}
       self.NTMs = {}
       self.MNTMs = {}
+      self._visitors = {
+          fa_parse.IntegerNode: self.visit_value,
+          fa_parse.BooleanNode: self.visit_value,
+          fa_parse.StringNode: self.visit_value,
+          fa_parse.VariableNode: self.visit_variable,
+          fa_parse.BinaryNode: self.visit_binary,
+          fa_parse.CollectionNode: self.visit_collection,
+          fa_parse.TupleNode: self.visit_tuple,
+          fa_parse.ParametersNode: self.visit_parameters,
+          fa_parse.DictionaryNode: self.visit_dictionary,
+          fa_parse.PrintNode: self.visit_print,
+          fa_parse.FunctionCallNode: self.visit_function_call,
+          fa_parse.DFANode: self.visit_dfa,
+          fa_parse.NFANode: self.visit_nfa,
+          fa_parse.DTMNode: self.visit_dtm,
+          fa_parse.AssignmentNode: self.visit_assignment,
+      }
       
   def visit(self, node):
       self.visit_helper(node) 
-      
-      for key, value in self.variables.items():
-        if value == None:
-            self.variables.pop(key)
-        
-      for key, value in self.DFAs.items():
-        if value == None:
-            self.DFAs.pop(key)
-            
-      for key, value in self.NFAs.items():
-        if value == None:
-            self.NFAs.pop(key)
  
   def isvariable(self, name):
       return name in self.variables
@@ -40,204 +45,202 @@ class Visitor:
       return self.variables[name]['type']
   
   def visit_helper(self, node):
-    if node['type'] == 'integer':
-        return node['value'], node['type']
-    if node['type'] == 'boolean':
-        return node['value'], node['type']
-    if node['type'] == 'string':
-        return node['value'], node['type']
-    
-    if node['type'] == 'variable':
-        return self.valueof(node['value']), self.typeof(node['value'])
+    return self._visitors[type(node)](node)
 
-       
-    if node['type'] == 'binary':
-        lvalue, ltype = self.visit_helper(node['left'])
-        rvalue, rtype = self.visit_helper(node['right'])
+  def visit_value(self, node):
+    return node.value, node.node_type
 
-        operator = node['operator']['value']
+  def visit_variable(self, node):
+    return self.valueof(node.value), self.typeof(node.value)
 
-        if operator == '+':
-            return lvalue + rvalue, rtype
-        
-    if node['type'] == 'collection':
-        is_dict = False
-        for element in node['value']:
-            if element['type'] == 'dictionary':
-                is_dict = True
-        if is_dict:
-            collection = dict()
-            for element in node['value']:
-                if element['type'] == 'variable':
-                    right_value, right_type = self.visit_helper(element)
-                    for key in right_value:
-                         collection[key] = right_value[key]
-                else:
-                    right_key, right_value, right_type = self.visit_helper(element)
-                    collection[right_key] = right_value
-            return collection, 'dictionary'
-        else:
-            collection = set()
-            for element in node['value']:
+  def visit_binary(self, node):
+    lvalue, ltype = self.visit_helper(node.left)
+    rvalue, rtype = self.visit_helper(node.right)
+
+    operator = node.operator.value
+
+    if operator == '+':
+        return lvalue + rvalue, rtype
+
+  def visit_collection(self, node):
+    is_dict = False
+    for element in node.value:
+        if type(element) == fa_parse.DictionaryNode:
+            is_dict = True
+    if is_dict:
+        collection = dict()
+        for element in node.value:
+            if type(element) == fa_parse.VariableNode:
                 right_value, right_type = self.visit_helper(element)
-                collection.add(right_value)
-            return collection, node['type']
-        
-    if node['type'] == 'tuple':
-        collection = list()
-        for element in node['value']:
-           right_value, right_type = self.visit_helper(element) 
-           collection.append(right_value)
-        collection = tuple(collection)
-        return collection, node['type']
-    
-    if node['type'] == 'parameters':
-        collection = list()
-        for element in node['value']:
+                for key in right_value:
+                     collection[key] = right_value[key]
+            else:
+                right_key, right_value, right_type = self.visit_helper(element)
+                collection[right_key] = right_value
+        return collection, 'dictionary'
+    else:
+        collection = set()
+        for element in node.value:
             right_value, right_type = self.visit_helper(element)
-            collection.append(right_value)
-        return collection, node['type']
-  
-    if node['type'] == 'dictionary':
-        key_value, key_type = self.visit_helper(node['key'])
-        value_value, value_type = self.visit_helper(node['value'])
-        return key_value, value_value, node['type']
-    
-    if node['type'] == 'print_func':
-        right_value, right_type = self.visit_helper(node['value'])
-        if type(right_value) == list and len(right_value) == 0:
-            right_value = '' 
-        self.printables.append(
-            {node['to_print']: {
-                'value': right_value,
-                'type': right_type
-            }
-        })
+            collection.add(right_value)
+        return collection, node.node_type
 
-        return None, None
+  def visit_tuple(self, node):
+    collection = list()
+    for element in node.value:
+       right_value, right_type = self.visit_helper(element) 
+       collection.append(right_value)
+    collection = tuple(collection)
+    return collection, node.node_type
+
+  def visit_parameters(self, node):
+    collection = list()
+    for element in node.value:
+        right_value, right_type = self.visit_helper(element)
+        collection.append(right_value)
+    return collection, node.node_type
+
+  def visit_dictionary(self, node):
+    key_value, key_type = self.visit_helper(node.key)
+    value_value, value_type = self.visit_helper(node.value)
+    return key_value, value_value, node.node_type
+
+  def visit_print(self, node):
+    right_value, right_type = self.visit_helper(node.value)
+    return self.print_value(node.variable, right_value, right_type)
+
+  def print_value(self, variable, right_value, right_type):
+    if type(right_value) == list and len(right_value) == 0:
+        right_value = '' 
+    self.printables.append(
+        {variable: {
+            'value': right_value,
+            'type': right_type
+        }
+    })
+
+    return None, None
+
+  def visit_function_call(self, node):
+    right_parameters_value, right_parameters_type = self.visit_helper(node.parameters)
+    return self.call(node.variable.value, node.func_name.value, right_parameters_value), node.node_type
+
+  def call(self, variable, function_name, right_parameters_value):
+    """ Calls helpers.<function_name> on the machine named `variable` """
+    default_file = variable + ".png"
     
-    if node['type'] == 'function_call':
-        right_parameters_value, right_parameters_type = self.visit_helper(node['parameters'])
-        function_name = node['function_name'].asdict()['value']
-        default_file = node['variable'] + ".png"
+    parameters = []
+    if function_name not in ['open']:
+        parameters.append(self.variables[variable]['value'])
+    if function_name in ['open', 'save']:
+        if len(right_parameters_value) > 0:
+            if str(right_parameters_value[0]).lower().endswith(('.png', '.jpg', '.jpeg', '.svg', '.pdf', '.dot', '.gv')):
+                default_file = right_parameters_value[0]
+                right_parameters_value.pop(0) 
+        parameters.append(default_file)
         
-        parameters = []
-        if function_name not in ['open']:
-            parameters.append(self.variables[node['variable']]['value'])
-        if function_name in ['open', 'save']:
-            if len(right_parameters_value) > 0:
-                if str(right_parameters_value[0]).lower().endswith(('.png', '.jpg', '.jpeg', '.svg', '.pdf')):
-                    default_file = right_parameters_value[0]
-                    right_parameters_value.pop(0) 
-            parameters.append(default_file)
-            
-        for i in right_parameters_value:
-            parameters.append(i) 
-            
-        return getattr(helpers, function_name)(*parameters), node['type']
-    
-    if node['type'] == 'dfa':
-        parameters = list()
-        for element in node['value']:
-            right_value, right_type = self.visit_helper(element)
-            parameters.append(right_value)
-           
-        try: 
-            if len(parameters) == 6:
-                parameters = helpers.make_DFA(
-                                parameters[0],
-                                parameters[1],
-                                parameters[2],
-                                parameters[3],
-                                parameters[4],
-                                parameters[5]
-                            )
-            else:
-                parameters = helpers.make_DFA(
-                                parameters[0],
-                                parameters[1],
-                                parameters[2],
-                                parameters[3],
-                                parameters[4],
-                            )
-        except Exception as ex:
-            if isinstance(ex, IndexError):
-                template = "Invalid parameter size for FA\n"
-                print(template)
-            else:
-                template = "An exception of type {0} occurred:\n{1!r}"
-                message = template.format(type(ex).__name__, ex.args[0])
-                print(message)
-            return None, None
+    for i in right_parameters_value:
+        parameters.append(i) 
         
-        return parameters, node['type']
+    return getattr(helpers, function_name)(*parameters)
+
+  def visit_dfa(self, node):
+    return self.make_dfa(self.visit_parameters(node)[0])
+
+  def make_dfa(self, parameters):
+    try: 
+        if len(parameters) == 6:
+            parameters = helpers.make_DFA(
+                            parameters[0],
+                            parameters[1],
+                            parameters[2],
+                            parameters[3],
+                            parameters[4],
+                            parameters[5]
+                        )
+        else:
+            parameters = helpers.make_DFA(
+                            parameters[0],
+                            parameters[1],
+                            parameters[2],
+                            parameters[3],
+                            parameters[4],
+                        )
+    except Exception as ex:
+        if isinstance(ex, IndexError):
+            template = "Invalid parameter size for FA\n"
+            print(template)
+        else:
+            template = "An exception of type {0} occurred:\n{1!r}"
+            message = template.format(type(ex).__name__, ex.args[0])
+            print(message)
+        return None, None
     
-    if node['type'] == 'nfa':
-        parameters = list()
-        for element in node['value']:
-            right_value, right_type = self.visit_helper(element)
-            parameters.append(right_value)
-           
-        try: 
-            parameters = helpers.make_NFA(
-                parameters[0],
-                parameters[1],
-                parameters[2],
-                parameters[3],
-                parameters[4]
-            )
-        except Exception as e:
-            print()
-            print(str(e))
-            return None, None
-        
-        return parameters, node['type']
+    return parameters, fa_parse.DFANode.node_type
+
+  def visit_nfa(self, node):
+    return self.make_nfa(self.visit_parameters(node)[0])
+
+  def make_nfa(self, parameters):
+    try: 
+        parameters = helpers.make_NFA(
+            parameters[0],
+            parameters[1],
+            parameters[2],
+            parameters[3],
+            parameters[4]
+        )
+    except Exception as e:
+        print()
+        print(str(e))
+        return None, None
     
-    if node['type'] == 'dtm':
-        parameters = list()
-        for element in node['value']:
-            right_value, right_type = self.visit_helper(element)
-            parameters.append(right_value)
-           
-        try: 
-            parameters = helpers.make_DTM(
-                parameters[0],
-                parameters[1],
-                parameters[2],
-                parameters[3],
-                parameters[4],
-                parameters[5],
-                parameters[6]
-            )
-        except Exception as e:
-            print()
-            print(str(e))
-            return None, None
-        
-        return parameters, node['type']
-        
-    if node['type'] == 'assignment':
-        right_value, right_type = self.visit_helper(node['value'])
-        if type(right_value) != pd.DataFrame:
-            if right_value != None and right_type != None:
-                if right_type == 'dfa':
-                    self.DFAs[node['variable']] = {
-                        'value': right_value,
-                        'type': right_type
-                    }
-                if right_type == 'nfa':
-                    self.NFAs[node['variable']] = {
-                        'value': right_value,
-                        'type': right_type
-                    } 
-                if right_type == 'dtm':
-                    self.DTMs[node['variable']] = {
-                        'value': right_value,
-                        'type': right_type
-                    }
-        self.variables[node['variable']] = {
+    return parameters, fa_parse.NFANode.node_type
+
+  def visit_dtm(self, node):
+    return self.make_dtm(self.visit_parameters(node)[0])
+
+  def make_dtm(self, parameters):
+    try: 
+        parameters = helpers.make_DTM(
+            parameters[0],
+            parameters[1],
+            parameters[2],
+            parameters[3],
+            parameters[4],
+            parameters[5],
+            parameters[6]
+        )
+    except Exception as e:
+        print()
+        print(str(e))
+        return None, None
+    
+    return parameters, fa_parse.DTMNode.node_type
+
+  def visit_assignment(self, node):
+    right_value, right_type = self.visit_helper(node.value)
+    return self.assign(node.variable.value, right_value, right_type)
+
+  def assign(self, name, right_value, right_type):
+    # Keep the symbol tables consistent as we go: a name lives in at most
+    # one machine table, and failed constructions are never stored.
+    for table in (self.DFAs, self.NFAs, self.DTMs):
+        table.pop(name, None)
+
+    if right_value is None or right_type is None:
+        self.variables.pop(name, None)
+        return None, None
+
+    machines = {'dfa': self.DFAs, 'nfa': self.NFAs, 'dtm': self.DTMs}
+    if right_type in machines:
+        machines[right_type][name] = {
             'value': right_value,
             'type': right_type
         }
+    self.variables[name] = {
+        'value': right_value,
+        'type': right_type
+    }
 
-        return None, None
\ No newline at end of file
+    return None, None
@@ -0,0 +1,206 @@
+"""
+Many .theory scripts run side by side, e.g. by a grader.
+
+Each script runs in a process of its own, forked from one that has already
+imported the interpreter and the packages it loads lazily, so no script
+pays for those imports and a script that crashes, hangs or exits takes no
+other script with it. Scripts run from their own directory, with what
+they print and any errors written to an output file of their own, and a
+summary of how each one ended and how long it took is printed last.
+
+Where processes cannot be forked, each one imports the interpreter anew.
+"""
+import glob
+import multiprocessing
+import multiprocessing.connection
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+import interpret.file_interface as file_interface
+import interpret.lazy as lazy
+import interpret.render_queue as render_queue
+
+# Imported before any script starts, for the forked processes to share
+WARM_MODULES = ["pandas", "numpy", "coloraide", "pygraphviz"]
+
+# Seconds a timed-out script is given to stop before it is killed
+KILL_GRACE = 1.0
+
+class Result(NamedTuple):
+    """How one script's run ended."""
+    script: str
+    status: str
+    seconds: float
+    output: str
+
+def is_pattern(path: str) -> bool:
+    """Whether `path` is a glob pattern rather than the name of a file."""
+    return glob.escape(path) != path
+
+def find_scripts(paths: Iterable[str]) -> List[str]:
+    """
+    The .theory files `paths` name: files as given, every .theory file
+    under a directory, and the matches of a glob pattern, each once.
+    """
+    scripts = []
+    for path in paths:
+        if os.path.isdir(path):
+            matches = sorted(glob.glob(os.path.join(glob.escape(path), "**", "*.theory"), recursive=True))
+        elif is_pattern(path):
+            matches = sorted(glob.glob(path, recursive=True))
+        else:
+            matches = [path]
+        scripts.extend(matches)
+    return list(dict.fromkeys(os.path.abspath(script) for script in scripts))
+
+def warm() -> None:
+    """Imports the packages the interpreter otherwise loads lazily, so the
+    processes forked for scripts have them already."""
+    for name in WARM_MODULES:
+        lazy.available(lazy.LazyModule(name))
+
+def _output_names(scripts: List[str]) -> Dict[str, str]:
+    """Each script's output file name: its path below the directory all
+    the scripts share, ending in .out instead of .theory."""
+    common = os.path.commonpath([os.path.dirname(script) for script in scripts])
+    return {
+        script: os.path.splitext(os.path.relpath(script, common))[0] + ".out"
+        for script in scripts
+    }
+
+def _run_script(script: str, output: str, configure: Callable, arguments: Any) -> None:
+    """Runs `script` in this process with its output going to `output`."""
+    descriptor = os.open(output, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    os.dup2(descriptor, sys.stdout.fileno())
+    os.dup2(descriptor, sys.stderr.fileno())
+    os.close(descriptor)
+    null = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(null, sys.stdin.fileno())
+    os.close(null)
+
+    configure(arguments)
+    # The scripts already keep every core busy
+    render_queue.WORKERS = 1
+    os.chdir(os.path.dirname(script))
+    try:
+        file_interface.interpret(os.path.basename(script))
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+def _status(exitcode: Optional[int]) -> str:
+    if exitcode == 0:
+        return "ok"
+    if exitcode is not None and exitcode < 0:
+        try:
+            return "crashed ({})".format(signal.Signals(-exitcode).name)
+        except ValueError:
+            return "crashed (signal {})".format(-exitcode)
+    return "failed (exit status {})".format(exitcode)
+
+def run(
+    scripts: List[str],
+    jobs: int,
+    timeout: Optional[float],
+    output_directory: Optional[str],
+    configure: Callable,
+    arguments: Any,
+) -> List[Result]:
+    """
+    Runs `scripts`, `jobs` at a time, each for at most `timeout` seconds.
+
+    With an `output_directory`, each script's output is kept in it;
+    without one, it is printed once the script ends. `configure(arguments)`
+    applies the command line's settings in each script's process.
+
+    Returns:
+        List[Result]: How each script ended, in the order they were given.
+    """
+    warm()
+    context = multiprocessing.get_context(
+        "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+    )
+    kept = output_directory is not None
+    if not kept:
+        output_directory = tempfile.mkdtemp(prefix="automython-")
+    names = _output_names(scripts)
+
+    waiting = list(reversed(scripts))
+    running = {}
+    results = {}
+    try:
+        while waiting or running:
+            while waiting and len(running) < jobs:
+                script = waiting.pop()
+                output = os.path.join(output_directory, names[script])
+                os.makedirs(os.path.dirname(output), exist_ok=True)
+                process = context.Process(target=_run_script, args=(script, output, configure, arguments))
+                # Or what is still buffered would be printed again by the child
+                sys.stdout.flush()
+                sys.stderr.flush()
+                process.start()
+                running[process.sentinel] = (script, output, process, time.perf_counter())
+
+            now = time.perf_counter()
+            deadline = None
+            if timeout:
+                deadline = max(0.0, min(started + timeout for _, _, _, started in running.values()) - now)
+            multiprocessing.connection.wait(list(running), deadline)
+
+            now = time.perf_counter()
+            for sentinel, (script, output, process, started) in list(running.items()):
+                if not process.is_alive():
+                    process.join()
+                    status = _status(process.exitcode)
+                elif timeout and now - started >= timeout:
+                    process.terminate()
+                    process.join(KILL_GRACE)
+                    if process.is_alive():
+                        process.kill()
+                        process.join()
+                    status = "timed out"
+                else:
+                    continue
+                del running[sentinel]
+                results[script] = Result(script, status, now - started, output)
+                if not kept:
+                    _print_output(results[script])
+    finally:
+        for _, _, process, _ in running.values():
+            process.kill()
+        if not kept:
+            shutil.rmtree(output_directory, ignore_errors=True)
+
+    return [results[script] for script in scripts]
+
+def _print_output(result: Result) -> None:
+    print("==> {} <==".format(os.path.relpath(result.script)))
+    with open(result.output, "r", errors="replace") as output:
+        shutil.copyfileobj(output, sys.stdout)
+    sys.stdout.flush()
+
+def summary(results: List[Result], seconds: float, jobs: int) -> str:
+    """How each script ended and how long it took, after a count of them."""
+    passed = sum(result.status == "ok" for result in results)
+    lines = ["Ran {} scripts in {:.2f} s, {} at a time: {} ok, {} not".format(
+        len(results), seconds, jobs, passed, len(results) - passed
+    )]
+    width = max(len(result.status) for result in results)
+    for result in results:
+        lines.append("  {:<{}}  {:8.2f} s  {}".format(
+            result.status, width, result.seconds, os.path.relpath(result.script)
+        ))
+    return "\n".join(lines)
@@ -0,0 +1,66 @@
+"""
+Files the interpreter keeps between runs: compiled programs and rendered
+diagrams.
+
+Each is written under a temporary name next to where it belongs and moved
+into place in one step, so a run never reads half of a file another run
+is still writing, and one that fails part way leaves the old file alone.
+"""
+import os
+import pathlib
+import sys
+import tempfile
+from typing import (
+    Iterable,
+    Optional,
+)
+
+def stamp(version: int, modules: Iterable[str]) -> tuple:
+    """
+    What a cached file depends on besides its own input: the layout
+    `version` of its writer, Python's version and when each of `modules`
+    was last changed.
+    """
+    return (version, sys.version, tuple(os.stat(module).st_mtime_ns for module in modules))
+
+class AtomicFile:
+    """
+    A file that replaces `path` once commit() is called, and leaves it as
+    it was after discard(). As a context manager, it commits when its block
+    ends normally and discards when the block raises.
+    """
+
+    def __init__(self, path: pathlib.Path, mode: str = "wb", encoding: Optional[str] = None):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle, self._temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            self.file = os.fdopen(handle, mode, encoding=encoding)
+        except BaseException:
+            os.close(handle)
+            os.unlink(self._temporary)
+            raise
+
+    def __enter__(self):
+        return self.file
+
+    def __exit__(self, etype, evalue, etrace):
+        if etype is None:
+            self.commit()
+        else:
+            self.discard()
+
+    def commit(self) -> None:
+        try:
+            self.file.close()
+            os.replace(self._temporary, self.path)
+        except BaseException:
+            self.discard()
+            raise
+
+    def discard(self) -> None:
+        self.file.close()
+        try:
+            os.unlink(self._temporary)
+        except FileNotFoundError:
+            pass
@@ -3,8 +3,8 @@ import interpret.helpers as helpers
 import interpret.Parser as fa_parse
 import interpret.Lexer as fa_lex
 import interpret.Visitor as fa_visitor
-
-from IPython.display import display
+import interpret.lazy as lazy
+import interpret.render_queue as render_queue
 
 def cli():
     parser = fa_parse.Parser()
@@ -21,6 +21,7 @@ def cli():
                     print('Use exit() or quit() to exit.')
                     continue
                 if (line in ['exit()', 'quit()']):
+                    render_queue.report(render_queue.finish())
                     return
             except EOFError:
                 print()
@@ -42,7 +43,7 @@ def cli():
             try:
                 node = parser.parse_line()
                 if node:
-                    visitor.visit(node.asdict())
+                    visitor.visit(node)
             except Exception as ex:
                 template = "An exception of type {0} occurred:\n{1!r}"
                 message = template.format(type(ex).__name__, ex.args[0])
@@ -61,12 +62,14 @@ def cli():
         for i in visitor.printables:
             if type(i['print_func']['value']) == tuple:
                 if i['print_func']['value'][1] == 'ipython_display':
-                    display(i['print_func']['value'][0])
+                    lazy.display(i['print_func']['value'][0])
                 else:
                     print(i['print_func']['value'])
             else:
                 print(i['print_func']['value'])
         visitor.printables = []
+        # Diagrams saved in this block are on disk before the next prompt
+        render_queue.report(render_queue.finish())
         
 if __name__ == '__main__':
     cli()
\ No newline at end of file
@@ -0,0 +1,397 @@
+"""
+Parsed statements lowered to a flat tuple of instructions, run by a small
+stack machine against a Visitor's variables, and cached next to the
+script in __pycache__, so an unchanged script is neither lexed nor parsed
+again. The cache is written and read one statement at a time, so no more
+of a program than the statement being run is held in memory.
+
+Statements that assign a DFA, NFA or DTM built from literals alone, so
+that nothing but their text decides the machine, are kept under a hash
+of that text once their machine has been validated. Running them from
+the cache skips validation, and once the script is edited, each of them
+that has not changed is taken from the last program instead of being
+lexed and parsed again; only these are held in memory for that.
+
+Every instruction is an (opcode, argument) pair and every value on the
+stack is the (value, type) pair Visitor.visit_helper would return for the
+same node, so a compiled statement does exactly what visiting it does.
+The interactive prompt still visits its statements directly.
+"""
+import hashlib
+import marshal
+import os
+import pathlib
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+import automata
+import automata.base.config as automata_config
+
+import interpret.Lexer as fa_lex
+import interpret.cache_files as cache_files
+import interpret.Parser as fa_parse
+
+# Part of every cached program, so one compiled by an older compiler is
+# not run
+CACHE_VERSION = 4
+
+# Whether compiled programs are read and written; --no-compile-cache
+# clears it, so the script is lexed and parsed on every run
+ENABLED = True
+
+LOAD_CONST = 0      # push the (value, type) argument
+LOAD_NAME = 1       # push the variable named by the argument
+BINARY_ADD = 2      # pop two values, push their sum with the right one's type
+BUILD_SET = 3       # pop `count` values into a set of type `node_type`
+BUILD_TUPLE = 4     # pop `count` values into a tuple of type `node_type`
+BUILD_LIST = 5      # pop `count` values into a list of type `node_type`
+BUILD_ENTRY = 6     # pop a key and a value, push a dictionary entry
+BUILD_MAP = 7       # pop one item per flag: entries, or dicts to merge if set
+MAKE_DFA = 8        # pop a parameter list, push the DFA built from it
+MAKE_NFA = 9        # pop a parameter list, push the NFA built from it
+MAKE_DTM = 10       # pop a parameter list, push the DTM built from it
+CALL_METHOD = 11    # pop a parameter list, push (variable).function(...)
+PRINT = 12          # pop a value and queue it to be printed
+STORE = 13          # pop a value into the variable named by the argument
+POP_TOP = 14        # pop a value an expression statement left unused
+
+Instruction = Tuple[int, Any]
+Code = Tuple[Instruction, ...]
+
+# What a statement compiles to: the line it starts on, the key it is kept
+# under if it defines a machine that was validated, and its instructions
+Statement = Tuple[int, Optional[str], Code]
+
+MACHINE_NODES = (fa_parse.DFANode, fa_parse.NFANode, fa_parse.DTMNode)
+LITERAL_NODES = (
+    fa_parse.IntegerNode,
+    fa_parse.BooleanNode,
+    fa_parse.StringNode,
+    fa_parse.CollectionNode,
+    fa_parse.DictionaryNode,
+    fa_parse.BinaryNode,
+)
+
+def _compile_value(node, code: List[Instruction]) -> None:
+    code.append((LOAD_CONST, (node.value, node.node_type)))
+
+def _compile_variable(node, code: List[Instruction]) -> None:
+    code.append((LOAD_NAME, node.value))
+
+def _compile_binary(node, code: List[Instruction]) -> None:
+    # The parser only builds '+' expressions
+    _emit(node.left, code)
+    _emit(node.right, code)
+    code.append((BINARY_ADD, None))
+
+def _compile_elements(node, code: List[Instruction]) -> None:
+    for element in node.value:
+        _emit(element, code)
+
+def _compile_collection(node, code: List[Instruction]) -> None:
+    _compile_elements(node, code)
+    if any(type(element) == fa_parse.DictionaryNode for element in node.value):
+        merges = tuple(type(element) == fa_parse.VariableNode for element in node.value)
+        code.append((BUILD_MAP, merges))
+    else:
+        code.append((BUILD_SET, (len(node.value), node.node_type)))
+
+def _compile_tuple(node, code: List[Instruction]) -> None:
+    _compile_elements(node, code)
+    code.append((BUILD_TUPLE, (len(node.value), node.node_type)))
+
+def _compile_parameters(node, code: List[Instruction]) -> None:
+    _compile_elements(node, code)
+    code.append((BUILD_LIST, (len(node.value), node.node_type)))
+
+def _compile_dictionary(node, code: List[Instruction]) -> None:
+    _emit(node.key, code)
+    _emit(node.value, code)
+    code.append((BUILD_ENTRY, node.node_type))
+
+def _compile_machine(opcode: int) -> Callable:
+    def compile_machine(node, code: List[Instruction]) -> None:
+        _compile_parameters(node, code)
+        code.append((opcode, None))
+    return compile_machine
+
+def _compile_function_call(node, code: List[Instruction]) -> None:
+    _emit(node.parameters, code)
+    code.append((CALL_METHOD, (node.variable.value, node.func_name.value, node.node_type)))
+
+def _compile_print(node, code: List[Instruction]) -> None:
+    _emit(node.value, code)
+    code.append((PRINT, node.variable))
+
+def _compile_assignment(node, code: List[Instruction]) -> None:
+    _emit(node.value, code)
+    code.append((STORE, node.variable.value))
+
+_COMPILERS: Dict[type, Callable] = {
+    fa_parse.IntegerNode: _compile_value,
+    fa_parse.BooleanNode: _compile_value,
+    fa_parse.StringNode: _compile_value,
+    fa_parse.VariableNode: _compile_variable,
+    fa_parse.BinaryNode: _compile_binary,
+    fa_parse.CollectionNode: _compile_collection,
+    fa_parse.TupleNode: _compile_tuple,
+    fa_parse.ParametersNode: _compile_parameters,
+    fa_parse.DictionaryNode: _compile_dictionary,
+    fa_parse.PrintNode: _compile_print,
+    fa_parse.FunctionCallNode: _compile_function_call,
+    fa_parse.DFANode: _compile_machine(MAKE_DFA),
+    fa_parse.NFANode: _compile_machine(MAKE_NFA),
+    fa_parse.DTMNode: _compile_machine(MAKE_DTM),
+    fa_parse.AssignmentNode: _compile_assignment,
+}
+
+def _emit(node, code: List[Instruction]) -> None:
+    _COMPILERS[type(node)](node, code)
+
+def compile_node(node: fa_parse.Node) -> Code:
+    """The instructions that do what visiting the statement `node` does."""
+    code: List[Instruction] = []
+    _emit(node, code)
+    if not isinstance(node, (fa_parse.AssignmentNode, fa_parse.PrintNode)):
+        code.append((POP_TOP, None))
+    return tuple(code)
+
+def _is_literal(node: fa_parse.Node) -> bool:
+    """Whether `node` is built from literals alone, without variables or calls."""
+    if not isinstance(node, LITERAL_NODES):
+        return False
+    if isinstance(node, fa_parse.CollectionNode):
+        return all(_is_literal(element) for element in node.value)
+    if isinstance(node, fa_parse.DictionaryNode):
+        return _is_literal(node.key) and _is_literal(node.value)
+    if isinstance(node, fa_parse.BinaryNode):
+        return _is_literal(node.left) and _is_literal(node.right)
+    return True
+
+def is_machine_definition(node: fa_parse.Node) -> bool:
+    """Whether `node` assigns a machine that only its text decides."""
+    return (
+        isinstance(node, fa_parse.AssignmentNode)
+        and isinstance(node.value, MACHINE_NODES)
+        and all(_is_literal(element) for element in node.value.value)
+    )
+
+def statement_key(statement: str) -> str:
+    """What a machine definition is kept under: its text's hash."""
+    return hashlib.sha256(statement.encode("utf-8")).hexdigest()
+
+def _pop(stack: list, count: int) -> list:
+    if not count:
+        return []
+    items = stack[-count:]
+    del stack[-count:]
+    return items
+
+def _binary_add(visitor, stack: list, argument) -> None:
+    rvalue, rtype = stack.pop()
+    lvalue, ltype = stack.pop()
+    stack.append((lvalue + rvalue, rtype))
+
+def _build_set(visitor, stack: list, argument) -> None:
+    count, node_type = argument
+    collection = set()
+    for right_value, right_type in _pop(stack, count):
+        collection.add(right_value)
+    stack.append((collection, node_type))
+
+def _build_tuple(visitor, stack: list, argument) -> None:
+    count, node_type = argument
+    stack.append((tuple(right_value for right_value, right_type in _pop(stack, count)), node_type))
+
+def _build_list(visitor, stack: list, argument) -> None:
+    count, node_type = argument
+    stack.append(([right_value for right_value, right_type in _pop(stack, count)], node_type))
+
+def _build_entry(visitor, stack: list, argument) -> None:
+    value_value, value_type = stack.pop()
+    key_value, key_type = stack.pop()
+    stack.append((key_value, value_value, argument))
+
+def _build_map(visitor, stack: list, argument) -> None:
+    collection = dict()
+    for merge, item in zip(argument, _pop(stack, len(argument))):
+        if merge:
+            right_value, right_type = item
+            for key in right_value:
+                collection[key] = right_value[key]
+        else:
+            right_key, right_value, right_type = item
+            collection[right_key] = right_value
+    stack.append((collection, 'dictionary'))
+
+def _make_machine(make: Callable) -> Callable:
+    def make_machine(visitor, stack: list, argument) -> None:
+        parameters, parameters_type = stack.pop()
+        stack.append(make(visitor, parameters))
+    return make_machine
+
+def _call_method(visitor, stack: list, argument) -> None:
+    variable, function_name, node_type = argument
+    parameters, parameters_type = stack.pop()
+    stack.append((visitor.call(variable, function_name, parameters), node_type))
+
+def _print(visitor, stack: list, argument) -> None:
+    right_value, right_type = stack.pop()
+    visitor.print_value(argument, right_value, right_type)
+
+def _store(visitor, stack: list, argument) -> None:
+    right_value, right_type = stack.pop()
+    visitor.assign(argument, right_value, right_type)
+
+_OPERATIONS: Dict[int, Callable] = {
+    LOAD_CONST: lambda visitor, stack, argument: stack.append(argument),
+    LOAD_NAME: lambda visitor, stack, argument: stack.append(
+        (visitor.valueof(argument), visitor.typeof(argument))
+    ),
+    BINARY_ADD: _binary_add,
+    BUILD_SET: _build_set,
+    BUILD_TUPLE: _build_tuple,
+    BUILD_LIST: _build_list,
+    BUILD_ENTRY: _build_entry,
+    BUILD_MAP: _build_map,
+    MAKE_DFA: _make_machine(lambda visitor, parameters: visitor.make_dfa(parameters)),
+    MAKE_NFA: _make_machine(lambda visitor, parameters: visitor.make_nfa(parameters)),
+    MAKE_DTM: _make_machine(lambda visitor, parameters: visitor.make_dtm(parameters)),
+    CALL_METHOD: _call_method,
+    PRINT: _print,
+    STORE: _store,
+    POP_TOP: lambda visitor, stack, argument: stack.pop(),
+}
+
+def run(visitor, code: Code, validate: bool = True) -> None:
+    """Runs compiled `code` against the variables and printables of
+    `visitor`, building machines without validating them unless
+    `validate` is set."""
+    stack: list = []
+    operations = _OPERATIONS
+    if validate:
+        for opcode, argument in code:
+            operations[opcode](visitor, stack, argument)
+        return
+    validating = automata_config.should_validate_automata
+    automata_config.should_validate_automata = False
+    try:
+        for opcode, argument in code:
+            operations[opcode](visitor, stack, argument)
+    finally:
+        automata_config.should_validate_automata = validating
+
+def cache_path(script: str) -> pathlib.Path:
+    """Where the compiled form of `script` is kept, like its bytecode would be."""
+    script = pathlib.Path(script)
+    return script.parent / "__pycache__" / (script.name + ".code")
+
+def _stamp() -> tuple:
+    """What compiled programs depend on besides their script: this
+    compiler, the parser and lexer whose nodes it compiles, and
+    automata-lib, which validated the machines they define."""
+    return cache_files.stamp(
+        CACHE_VERSION, [__file__, fa_parse.__file__, fa_lex.__file__, automata.__file__]
+    )
+
+def source_stamp(script: str) -> Tuple[int, int]:
+    """The modification time and size of `script`, which bytecode is
+    checked against too, read before the script is."""
+    stat = os.stat(script)
+    return stat.st_mtime_ns, stat.st_size
+
+def load(script: str, source: Tuple[int, int]) -> Optional[Iterator[Statement]]:
+    """The program compiled from `script` as it was at `source`, read a
+    statement at a time as it is run, or None when there is none."""
+    try:
+        file = open(cache_path(script), "rb")
+    except OSError:
+        return None
+    try:
+        stamp, cached_source = marshal.load(file)
+        current = stamp == _stamp() and tuple(cached_source) == source
+    except Exception:
+        current = False
+    if not current:
+        file.close()
+        return None
+    return _read(file)
+
+def machine_definitions(script: str) -> Dict[str, Code]:
+    """The machine definitions of the program compiled from `script`, by
+    key, whatever the script was like when it was compiled."""
+    definitions = {}
+    try:
+        with open(cache_path(script), "rb") as file:
+            stamp, cached_source = marshal.load(file)
+            if stamp != _stamp():
+                return {}
+            for first_line, key, code in _read(file):
+                if key:
+                    definitions[key] = code
+    except Exception:
+        # A missing, unreadable or outdated program has none to reuse
+        return {}
+    return definitions
+
+def _read(file: BinaryIO) -> Iterator[Statement]:
+    with file:
+        while True:
+            try:
+                statement = marshal.load(file)
+            except EOFError:
+                # Only whole programs are moved into place, so this file
+                # was cut short after it was written
+                raise ValueError("{} is incomplete; run with --no-compile-cache".format(file.name))
+            if statement is None:
+                return
+            yield statement
+
+class ProgramWriter:
+    """
+    Keeps the program compiled from `script` as it was at `source`, written
+    a statement at a time as the script runs rather than held whole. The
+    program kept before is replaced by commit(), once the last statement
+    has been written, and left as it was by discard().
+    """
+
+    def __init__(self, script: str, source: Tuple[int, int]):
+        self._file: Optional[cache_files.AtomicFile] = None
+        try:
+            self._file = cache_files.AtomicFile(cache_path(script))
+            marshal.dump((_stamp(), source), self._file.file)
+        except OSError:
+            # A script in a read-only directory is compiled on every run
+            self.discard()
+
+    def write(self, statement: Statement) -> None:
+        if self._file is None:
+            return
+        try:
+            marshal.dump(statement, self._file.file)
+        except OSError:
+            self.discard()
+
+    def commit(self) -> None:
+        if self._file is None:
+            return
+        try:
+            # Marks the end, so a program cut short is never run
+            marshal.dump(None, self._file.file)
+            self._file.commit()
+        except OSError:
+            pass
+        self._file = None
+
+    def discard(self) -> None:
+        if self._file is not None:
+            self._file.discard()
+            self._file = None
@@ -0,0 +1,494 @@
+import automata.fa.nfa as nfa
+import interpret.lazy as lazy
+import interpret.utils as utils
+import weakref
+from collections import defaultdict
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+np = lazy.LazyModule("numpy")
+coloraide = lazy.LazyModule("coloraide")
+
+_compiled_cache: dict = {}
+
+def cached_for(target_fa: Any, build: Callable[[Any], Any]) -> Any:
+    """
+    Returns `build(target_fa)`, building it only once per machine object.
+
+    automata-lib machines are immutable and unhashable, so the cache is
+    keyed on identity and an entry is dropped when its machine is collected.
+    """
+    key = (id(target_fa), build)
+    entry = _compiled_cache.get(key)
+    if entry is None or entry[0]() is not target_fa:
+        ref = weakref.ref(target_fa, lambda _: _compiled_cache.pop(key, None))
+        entry = _compiled_cache[key] = (ref, build(target_fa))
+    return entry[1]
+
+def compile_dfa(target_fa) -> "CompiledDFA":
+    """Returns the cached CompiledDFA for `target_fa`."""
+    return cached_for(target_fa, CompiledDFA)
+
+class CompiledDFA:
+    """
+    A DFA with its states and symbols numbered, and its transitions held in
+    a dense int32 matrix indexed by [state, symbol].
+
+    One extra row is a dead state and one extra column stands for any
+    symbol outside the alphabet, so a missing transition or unknown symbol
+    leads to the dead state and rejects the word.
+    """
+
+    def __init__(self, target_fa):
+        self.states: List[Any] = list(target_fa.states)
+        self.state_index = {state: i for i, state in enumerate(self.states)}
+        self.dead = len(self.states)
+
+        # Words are read one character at a time, so only single character
+        # symbols can ever match.
+        symbols = sorted(s for s in target_fa.input_symbols if len(s) == 1)
+        self.symbol_index = {symbol: i for i, symbol in enumerate(symbols)}
+        self.unknown = len(symbols)
+
+        self.matrix = np.full((self.dead + 1, self.unknown + 1), self.dead, dtype=np.int32)
+        for from_state, lookup in target_fa.transitions.items():
+            row = self.state_index[from_state]
+            for symbol, to_state in lookup.items():
+                if symbol in self.symbol_index:
+                    self.matrix[row, self.symbol_index[symbol]] = self.state_index[to_state]
+
+        self.accepting = np.zeros(self.dead + 1, dtype=bool)
+        for state in target_fa.final_states:
+            self.accepting[self.state_index[state]] = True
+        self.initial = self.state_index[target_fa.initial_state]
+
+        # Code point -> symbol number; the last entry catches every code
+        # point above the alphabet's largest one.
+        largest = max((ord(symbol) for symbol in symbols), default=0)
+        self.lookup = np.full(largest + 2, self.unknown, dtype=np.int32)
+        for symbol, i in self.symbol_index.items():
+            self.lookup[ord(symbol)] = i
+
+        self._rows = self.matrix.tolist()
+
+    def state_name(self, index: int) -> Optional[Any]:
+        """The state numbered `index`, or None for the dead state."""
+        return None if index == self.dead else self.states[index]
+
+    def trace(self, input_str: str) -> list:
+        """
+        Walks a single word.
+
+        Returns:
+            list: The initial state followed by the state after each symbol;
+                None once the word has fallen into the dead state.
+        """
+        rows = self._rows
+        symbol_index = self.symbol_index
+        unknown = self.unknown
+        state = self.initial
+        path = [self.states[state]]
+
+        for symbol in input_str:
+            state = rows[state][symbol_index.get(symbol, unknown)]
+            path.append(self.state_name(state))
+
+        return path
+
+    def run(self, words: Iterable[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Runs every word at once. Words are bucketed by length and each bucket
+        steps in lockstep, one fancy-indexing lookup per symbol position.
+
+        Returns:
+            Tuple[ndarray, ndarray]: Whether each word was accepted, and the
+                number of the state it ended in (self.dead if it fell out).
+        """
+        words = list(words)
+        final = np.empty(len(words), dtype=np.int32)
+
+        buckets = defaultdict(list)
+        for i, word in enumerate(words):
+            buckets[len(word)].append(i)
+
+        for length, indices in buckets.items():
+            if length == 0:
+                final[indices] = self.initial
+                continue
+
+            codes = np.frombuffer(
+                "".join(words[i] for i in indices).encode("utf-32-le"),
+                dtype=np.uint32,
+            ).reshape(len(indices), length)
+            symbols = self.lookup[np.minimum(codes, len(self.lookup) - 1)]
+
+            state = np.full(len(indices), self.initial, dtype=np.int32)
+            for position in range(length):
+                state = self.matrix[state, symbols[:, position]]
+            final[indices] = state
+
+        return self.accepting[final], final
+
+    def accepts_all(self, words: Iterable[str]) -> dict:
+        """Each word mapped to True if accepted, False if rejected."""
+        words = list(words)
+        accepted, _ = self.run(words)
+        return dict(zip(words, accepted.tolist()))
+
+    def final_states(self, words: Iterable[str]) -> list:
+        """The state each word ends in, None if it fell out of the DFA."""
+        _, final = self.run(words)
+        return [self.state_name(index) for index in final.tolist()]
+
+def compile_nfa(target_fa) -> "CompiledNFA":
+    """Returns the cached CompiledNFA for `target_fa`."""
+    return cached_for(target_fa, CompiledNFA)
+
+# Most state sets a CompiledNFA remembers transitions for before it forgets
+# the oldest; 0 turns the cache off
+SUBSET_CACHE_SIZE = 4096
+
+def _bits(mask: int) -> Iterator[int]:
+    """The numbers of the set bits in `mask`, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+class CompiledNFA:
+    """
+    An NFA with its states numbered in `str` order and every set of states
+    held as an int bitmask, bit i standing for self.states[i].
+
+    Lambda closures are computed once, and folded into a step mask per
+    state and symbol: steps[symbol][i] is every state reachable from the
+    closure of state i by reading symbol and then following lambdas.
+
+    Steps between state sets are memoized as they are met, building the
+    subset construction DFA lazily: subsets[mask][symbol] is the mask
+    reached from mask on symbol. At most cache_size state sets are kept,
+    the oldest discovered being dropped first.
+    """
+
+    def __init__(self, target_fa, cache_size: int = SUBSET_CACHE_SIZE):
+        self.states: List[Any] = sorted(target_fa.states, key=str)
+        self.state_index = {state: i for i, state in enumerate(self.states)}
+        index = self.state_index
+        transitions = target_fa.transitions
+
+        # Raw edges, kept to draw a path edge by edge
+        self.lambdas: List[List[int]] = []
+        self.moves: dict = {}
+        for i, state in enumerate(self.states):
+            lookup = transitions.get(state, {})
+            self.lambdas.append(sorted(index[end] for end in lookup.get("", ())))
+            for symbol, ends in lookup.items():
+                # Words are read one character at a time
+                if len(symbol) == 1:
+                    moves = self.moves.setdefault(symbol, [0] * len(self.states))
+                    for end in ends:
+                        moves[i] |= 1 << index[end]
+
+        self.closures = [self._closure(i) for i in range(len(self.states))]
+
+        self.steps: dict = {}
+        for symbol, moves in self.moves.items():
+            landed = [self._union(self.closures, mask) for mask in moves]
+            self.steps[symbol] = [self._union(landed, mask) for mask in self.closures]
+
+        self.initial = index[target_fa.initial_state]
+        self.initial_mask = self.closures[self.initial]
+        self.final_mask = 0
+        for state in target_fa.final_states:
+            self.final_mask |= 1 << index[state]
+
+        self._chunk_tables: dict = {}
+        self.cache_size = cache_size
+        self.subsets: dict = {}
+
+    def _closure(self, start: int) -> int:
+        mask = 1 << start
+        stack = [start]
+        while stack:
+            for end in self.lambdas[stack.pop()]:
+                if not mask >> end & 1:
+                    mask |= 1 << end
+                    stack.append(end)
+        return mask
+
+    @staticmethod
+    def _union(masks: List[int], selection: int) -> int:
+        result = 0
+        for i in _bits(selection):
+            result |= masks[i]
+        return result
+
+    def _tables(self, symbol: str) -> Optional[List[List[int]]]:
+        """
+        Per-symbol lookup tables over the state mask taken eight bits at a
+        time: tables[c][byte] is the union of the step masks of the states
+        numbered 8c + b for each bit b set in byte. None if the machine has
+        no transitions on symbol.
+        """
+        tables = self._chunk_tables.get(symbol)
+        if tables is None and symbol in self.steps:
+            step = self.steps[symbol]
+            tables = []
+            for base in range(0, len(step), 8):
+                chunk = step[base:base + 8] + [0] * (8 - len(step[base:base + 8]))
+                table = [0] * 256
+                for byte in range(1, 256):
+                    low = byte & -byte
+                    table[byte] = table[byte ^ low] | chunk[low.bit_length() - 1]
+                tables.append(table)
+            self._chunk_tables[symbol] = tables
+        return tables
+
+    def advance(self, mask: int, symbol: str) -> int:
+        """Every state reachable from the states in `mask` on `symbol`."""
+        row = self.subsets.get(mask)
+        if row is None:
+            if not self.cache_size:
+                return self._advance(mask, symbol)
+            if len(self.subsets) >= self.cache_size:
+                del self.subsets[next(iter(self.subsets))]
+            row = self.subsets[mask] = {}
+
+        result = row.get(symbol)
+        if result is None:
+            result = row[symbol] = self._advance(mask, symbol)
+        return result
+
+    def _advance(self, mask: int, symbol: str) -> int:
+        tables = self._tables(symbol)
+        if tables is None:
+            return 0
+
+        result = 0
+        for table in tables:
+            if not mask:
+                break
+            result |= table[mask & 0xFF]
+            mask >>= 8
+        return result
+
+    def accepts(self, input_str: str) -> bool:
+        subsets = self.subsets
+        mask = self.initial_mask
+        for symbol in input_str:
+            # Inlined cache hit; anything else goes through advance
+            row = subsets.get(mask)
+            next_mask = row.get(symbol) if row is not None else None
+            mask = self.advance(mask, symbol) if next_mask is None else next_mask
+            if not mask:
+                return False
+        return bool(mask & self.final_mask)
+
+    def accepts_all(self, words: Iterable[str]) -> dict:
+        """Each word mapped to True if accepted, False if rejected."""
+        return {word: self.accepts(word) for word in words}
+
+    def witness(self, input_str: str) -> Tuple[bool, List[Any]]:
+        """
+        Finds one run for input_str: the states it passes through, one per
+        symbol read after the initial state. Every choice takes the lowest
+        numbered state, so the run is the same each time.
+
+        Returns:
+            Tuple[bool, list]: Whether input_str is accepted, and the run. A
+                rejected word gets the longest run it has, which is shorter
+                than input_str if it gets stuck.
+        """
+        # layers[k] is the set of states reachable after k symbols
+        layers = [1 << self.initial]
+        for symbol in input_str:
+            mask = self.advance(layers[-1], symbol)
+            if not mask:
+                break
+            layers.append(mask)
+
+        last = layers[-1]
+        if not input_str:
+            status = bool(self.initial_mask & self.final_mask)
+        else:
+            status = len(layers) > len(input_str) and bool(last & self.final_mask)
+            if status:
+                last &= self.final_mask
+
+        run = [next(_bits(last))]
+        for k in range(len(layers) - 1, 0, -1):
+            step = self.steps[input_str[k - 1]]
+            run.append(next(i for i in _bits(layers[k - 1]) if step[i] >> run[-1] & 1))
+        run.reverse()
+
+        return status, [self.states[i] for i in run]
+
+    def _lambda_route(self, start: int, goal: int) -> List[Tuple[int, int]]:
+        """The fewest lambda edges leading from state start to state goal."""
+        parents = {start: None}
+        queue = [start]
+        for state in queue:
+            if state == goal:
+                break
+            for end in self.lambdas[state]:
+                if end not in parents:
+                    parents[end] = state
+                    queue.append(end)
+
+        route = []
+        while parents[goal] is not None:
+            route.append((parents[goal], goal))
+            goal = parents[goal]
+        route.reverse()
+        return route
+
+    def input_path(self, input_str: str) -> Tuple[List[Tuple[Any, Any, str]], bool]:
+        """
+        The witness run spelled out as edges of the machine, with "" as the
+        symbol of a lambda edge, in the form automata-lib draws diagrams from.
+
+        Returns:
+            Tuple[list, bool]: (from_state, to_state, symbol) edges, and
+                whether input_str is accepted.
+        """
+        status, run = self.witness(input_str)
+        run = [self.state_index[state] for state in run]
+        edges = []
+
+        for start, goal, symbol in zip(run, run[1:], input_str):
+            # Cross the symbol from the lowest numbered state it can be
+            # read in, landing on the lowest state whose closure has goal
+            moves = self.moves[symbol]
+            reader, landing = next(
+                (reader, landing)
+                for reader in _bits(self.closures[start])
+                for landing in _bits(moves[reader])
+                if self.closures[landing] >> goal & 1
+            )
+            edges.extend((a, b, "") for a, b in self._lambda_route(start, reader))
+            edges.append((reader, landing, symbol))
+            edges.extend((a, b, "") for a, b in self._lambda_route(landing, goal))
+
+        if status and not self.final_mask >> run[-1] & 1:
+            # Only the empty word ends on a state whose closure is final
+            final = next(_bits(self.closures[run[-1]] & self.final_mask))
+            edges.extend((a, b, "") for a, b in self._lambda_route(run[-1], final))
+
+        return [(self.states[a], self.states[b], symbol) for a, b, symbol in edges], status
+
+class NFA(nfa.NFA):
+    """
+    An automata-lib NFA whose acceptance checks and diagram paths run on
+    its CompiledNFA. Keeps the class name so it prints like the original.
+    """
+
+    def accepts_input(self, input_str: str) -> bool:
+        return compile_nfa(self).accepts(input_str)
+
+    def _get_input_path(self, input_str: str) -> Tuple[List[Tuple[Any, Any, str]], bool]:
+        return compile_nfa(self).input_path(input_str)
+
+#https://github.com/caleb531/automata/blob/main/automata/fa/fa.py
+def make_diagram(
+    target_fa,
+    input_str: Optional[str] = None,
+    *,
+    horizontal: bool = True,
+    reverse_orientation: bool = False,
+    fig_size: Union[Tuple[float, float], Tuple[float], None] = None,
+    font_size: float = 14.0,
+    arrow_size: float = 0.85,
+    state_separation: float = 0.5,
+) -> "utils.pgv.AGraph":
+    """
+    Builds the graph automata-lib's show_diagram draws for a DFA or NFA,
+    without laying it out, for output that only needs the DOT source.
+    """
+    graph = utils.create_graph(
+        horizontal, reverse_orientation, fig_size, state_separation
+    )
+
+    font_size_str = str(font_size)
+    arrow_size_str = str(arrow_size)
+
+    # create unique id to avoid colliding with other states
+    null_node = utils.create_unique_random_id()
+
+    graph.add_node(
+        null_node,
+        label="",
+        tooltip=".",
+        shape="point",
+        fontsize=font_size_str,
+    )
+    initial_node = target_fa._get_state_name(target_fa.initial_state)
+    graph.add_edge(
+        null_node,
+        initial_node,
+        tooltip="->" + initial_node,
+        arrowsize=arrow_size_str,
+    )
+
+    nonfinal_states = map(target_fa._get_state_name, target_fa.states - target_fa.final_states)
+    final_states = map(target_fa._get_state_name, target_fa.final_states)
+    graph.add_nodes_from(nonfinal_states, shape="circle", fontsize=font_size_str)
+    graph.add_nodes_from(final_states, shape="doublecircle", fontsize=font_size_str)
+
+    is_edge_drawn = defaultdict(lambda: False)
+    if input_str is not None:
+        input_path, is_accepted = target_fa._get_input_path(input_str=input_str)
+
+        start_color = coloraide.Color("#ff0")
+        end_color = (
+            coloraide.Color("#0f0") if is_accepted else coloraide.Color("#f00")
+        )
+        interpolation = coloraide.Color.interpolate(
+            [start_color, end_color], space="srgb"
+        )
+
+        # find all transitions in the finite state machine with traversal.
+        for transition_index, (from_state, to_state, symbol) in enumerate(
+            input_path, start=1
+        ):
+            color = interpolation(transition_index / len(input_path))
+            label = target_fa._get_edge_name(symbol)
+
+            is_edge_drawn[from_state, to_state, symbol] = True
+            graph.add_edge(
+                target_fa._get_state_name(from_state),
+                target_fa._get_state_name(to_state),
+                label=f"<{label} <b>[<i>#{transition_index}</i>]</b>>",
+                arrowsize=arrow_size_str,
+                fontsize=font_size_str,
+                color=color.to_string(hex=True),
+                penwidth="2.5",
+            )
+
+    edge_labels = defaultdict(list)
+    for from_state, to_state, symbol in target_fa.iter_transitions():
+        if is_edge_drawn[from_state, to_state, symbol]:
+            continue
+
+        from_node = target_fa._get_state_name(from_state)
+        to_node = target_fa._get_state_name(to_state)
+        label = target_fa._get_edge_name(symbol)
+        edge_labels[from_node, to_node].append(label)
+
+    for (from_node, to_node), labels in edge_labels.items():
+        graph.add_edge(
+            from_node,
+            to_node,
+            label=",".join(sorted(labels)),
+            arrowsize=arrow_size_str,
+            fontsize=font_size_str,
+        )
+
+    return graph
@@ -1,57 +1,55 @@
 import interpret.Parser as fa_parse
 import interpret.Lexer as fa_lex
 import interpret.Visitor as fa_visitor
+import interpret.compiler as compiler
+import interpret.lazy as lazy
+import interpret.render_queue as render_queue
 
+import re
 import sys
 
-from IPython.display import display
+OPENING_BRACKETS = '({['
+CLOSING_BRACKETS = ')}]'
+
+# A string, whose brackets do not count, or a bracket; finds the same
+# brackets as lexing the line would, without building its tokens
+BRACKET_REGEX = re.compile(r'{}|[{}]'.format(
+  fa_lex.STRING_PATTERN, re.escape(OPENING_BRACKETS + CLOSING_BRACKETS)))
 
 def interpret(filename):
   parser = fa_parse.Parser()
   visitor = fa_visitor.Visitor()
   error_flag = True
-   
-  text = ''
   
   try:
-    all_lines = open(filename, "r").read().splitlines()
-    
-    for line in all_lines:
-      if line:
-        line = ''.join(line.split())
-        text += line + '\n'
-      else:
-        text += '\n'
-        
-    parser.lexer.load(text)
-    
-    #print(parser.lexer.get_tokens())
-     
-    t = parser.lexer.peek_token()
-    while (t.type != fa_lex.EOF):
-      node = parser.parse_line()
-      if node:
-        visitor.visit(node.asdict())
-      t = parser.lexer.peek_token()
-      if (t.type == fa_lex.EOL):
-        t = parser.lexer.get_token()
-        t = parser.lexer.peek_token()
-        while (t.type == fa_lex.EOL):
-          if t.type == fa_lex.EOL:
-            t = parser.lexer.get_token()
-          t = parser.lexer.peek_token()
-        
-    for i in visitor.printables:
-      if type(i['print_func']['value']) == tuple:
-        if i['print_func']['value'][1] == 'ipython_display':
-          display(i['print_func']['value'][0])
-        else:
-          print(i['print_func']['value'])
-      else:
-        print(i['print_func']['value'])
-    visitor.printables = []
+    source_stamp = compiler.source_stamp(filename)
+    program = compiler.load(filename, source_stamp) if compiler.ENABLED else None
+    if program is None:
+      # Machine definitions the script had before it was edited
+      definitions = compiler.machine_definitions(filename) if compiler.ENABLED else {}
+      writer = compiler.ProgramWriter(filename, source_stamp) if compiler.ENABLED else None
+      try:
+        with open(filename, "r") as source:
+          for statement, first_line in statements(source):
+            compiled = execute(parser, visitor, statement, first_line, definitions)
+            if writer:
+              writer.write(compiled)
+            flush(visitor)
+      except BaseException:
+        if writer:
+          writer.discard()
+        raise
+      if writer:
+        writer.commit()
+    else:
+      # Compiled by an earlier run of the unchanged script
+      for compiled in program:
+        run(visitor, compiled)
+        flush(visitor)
+    failures = render_queue.finish()
+    render_queue.report(failures)
           
-    error_flag = False
+    error_flag = bool(failures)
     
   except EOFError:
     sys.exit(0)
@@ -64,6 +62,98 @@ def interpret(filename):
     
   if error_flag:
     sys.exit(1)
+
+def statements(source):
+  """ Reads `source` line by line and yields each statement, with the line
+  it starts on, as soon as its brackets balance. Only the statement being
+  read is held in memory, never the whole file. """
+  pending = []
+  depth = 0
+  first_line = 1
+  
+  for number, line in enumerate(source, start=1):
+    line = ''.join(line.split())
+    if not pending:
+      if not line:
+        continue
+      first_line = number
+      
+    pending.append(line)
+    depth += bracket_depth(line)
+    if depth <= 0:
+      yield '\n'.join(pending) + '\n', first_line
+      pending = []
+      depth = 0
+      
+  if pending:
+    yield '\n'.join(pending) + '\n', first_line
+
+def bracket_depth(line):
+  """ Net number of brackets `line` leaves open, ignoring those in strings """
+  depth = 0
+  for match in BRACKET_REGEX.finditer(line):
+    bracket = match.group()
+    if bracket in OPENING_BRACKETS:
+      depth += 1
+    elif bracket in CLOSING_BRACKETS:
+      depth -= 1
+  return depth
+
+def execute(parser, visitor, text, first_line=1, definitions=None):
+  """ Compiles and runs the statements in `text`, unless it is one of the
+  machine `definitions` compiled before, which is run as it was compiled,
+  without validating its machine again. Returns them compiled, as
+  compiler.Statement """
+  render_queue.line = first_line
+  key = compiler.statement_key(text)
+  if definitions and key in definitions:
+    code = definitions[key]
+    compiler.run(visitor, code, validate=False)
+    return first_line, key, code
+
+  parser.lexer.load(text, first_line)
+  nodes = []
+  code = []
+  
+  t = parser.lexer.peek_token()
+  while (t.type != fa_lex.EOF):
+    node = parser.parse_line()
+    if node:
+      compiled = compiler.compile_node(node)
+      compiler.run(visitor, compiled)
+      nodes.append(node)
+      code.extend(compiled)
+    t = parser.lexer.peek_token()
+    while (t.type == fa_lex.EOL):
+      parser.lexer.get_token()
+      t = parser.lexer.peek_token()
+      
+  code = tuple(code)
+  # A machine that failed to build is never assigned, and is validated
+  # again the next run to report why
+  if (len(nodes) == 1 and compiler.is_machine_definition(nodes[0])
+      and nodes[0].variable.value in visitor.variables):
+    return first_line, key, code
+  return first_line, None, code
+
+def run(visitor, compiled):
+  """ Runs one compiler.Statement, without validating the machine it
+  defines if it was validated when it was compiled """
+  first_line, key, code = compiled
+  render_queue.line = first_line
+  compiler.run(visitor, code, validate=key is None)
+
+def flush(visitor):
+  for i in visitor.printables:
+    if type(i['print_func']['value']) == tuple:
+      if i['print_func']['value'][1] == 'ipython_display':
+        lazy.display(i['print_func']['value'][0])
+      else:
+        print(i['print_func']['value'])
+    else:
+      print(i['print_func']['value'])
+  visitor.printables = []
+  sys.stdout.flush()
     
 if __name__ == '__main__':
   if len(sys.argv) == 2 and sys.argv[1].lower().endswith('.theory'):
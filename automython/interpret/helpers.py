@@ -1,21 +1,49 @@
 from automata.fa.dfa import DFA
 from automata.fa.nfa import NFA
 from automata.tm.dtm import DTM
-from automata.tm.ntm import NTM
-from automata.tm.mntm import MNTM
+from automata.base.utils import frozendict
 import interpret.tm_helpers as tm_helpers
-
-import random
-import copy
-from forbiddenfruit import curse
-from typing import Union
-import pandas as pd
+import interpret.fa_helpers as fa_helpers
+import interpret.trace_helpers as trace_helpers
+import interpret.lazy as lazy
+import interpret.render_queue as render_queue
+
+import builtins
+from typing import Any, Tuple, Union
+pd = lazy.LazyModule("pandas")
 import subprocess, os, platform
 
-def dict_deepcopy(self) -> dict:
-    return copy.deepcopy(dict(self))
-
-curse(dict, "deepcopy", dict_deepcopy)
+def frozen_copy(value: Any) -> Any:
+    """
+    Copies part of a machine definition into an immutable one: dicts become
+    frozendicts, sets frozensets and lists tuples, all the way down.
+
+    Whatever is already immutable all the way down is shared rather than
+    copied, so copying automata-lib's own frozen transitions returns them
+    as they are, and a copy only rebuilds the parts that were mutable.
+
+    Args:
+        value (Any): The value to copy.
+
+    Returns:
+        Any: `value` itself if nothing in it can change, else its frozen copy.
+    """
+    if isinstance(value, dict):
+        items = {key: frozen_copy(item) for key, item in value.items()}
+        if isinstance(value, frozendict) and all(items[key] is item for key, item in value.items()):
+            return value
+        return frozendict(items)
+    if isinstance(value, (set, frozenset)):
+        elements = [frozen_copy(element) for element in value]
+        if isinstance(value, frozenset) and all(a is b for a, b in zip(elements, value)):
+            return value
+        return frozenset(elements)
+    if isinstance(value, (list, tuple)):
+        elements = tuple(frozen_copy(element) for element in value)
+        if isinstance(value, tuple) and all(a is b for a, b in zip(elements, value)):
+            return value
+        return elements
+    return value
 
 
 def system_type():
@@ -33,7 +61,7 @@ def definition(*args):
     return table
 
 #https://github.com/lewiuberg/visual-automata/blob/master/visual_automata/fa/nfa.py
-def make_dfa_table(target_fa) -> pd.DataFrame:
+def make_dfa_table(target_fa) -> "pd.DataFrame":
     initial_state = target_fa.initial_state
     final_states = target_fa.final_states
 
@@ -78,7 +106,7 @@ def make_dfa_table(target_fa) -> pd.DataFrame:
     return df.reindex(sorted(df.columns), axis=1)
 
 #https://github.com/lewiuberg/visual-automata/blob/master/visual_automata/fa/nfa.py
-def make_nfa_table(target_fa) -> pd.DataFrame:
+def make_nfa_table(target_fa) -> "pd.DataFrame":
         """
         Generates a transition table of the given VisualNFA.
 
@@ -88,7 +116,7 @@ def make_nfa_table(target_fa) -> pd.DataFrame:
 
         final_states = "".join(target_fa.final_states)
 
-        transitions = _nfa_add_lambda(all_transitions=target_fa.transitions)
+        transitions = fa_helpers.cached_for(target_fa, _nfa_lambda_transitions)
 
         table: dict = {}
         for state, transition in sorted(transitions.items()):
@@ -120,7 +148,7 @@ def make_nfa_table(target_fa) -> pd.DataFrame:
         table = table.reindex(sorted(table.columns), axis=1)
         return table
     
-def make_dtm_table(target_fa) -> pd.DataFrame:
+def make_dtm_table(target_fa) -> "pd.DataFrame":
     initial_state = target_fa.dtm.initial_state
     final_states = target_fa.dtm.final_states
 
@@ -175,17 +203,23 @@ def _nfa_add_lambda(all_transitions: dict) -> dict:
             input_symbols (str): The NFA's input symbols/alphabet.
 
         Returns:
-            dict: Transitions with λ for lambda transitions
+            dict: Transitions with λ for lambda transitions, as a frozen copy
+                sharing every state's transitions that have no lambda.
         """
-        all_transitions = all_transitions.deepcopy()
+        all_transitions = frozen_copy(all_transitions)
         # Replacing '' key name for empty string (lambda/epsilon) transitions.
-        for transitions in all_transitions.values():
-            transitions = transitions.deepcopy()
-            for state, transition in list(transitions.items()):
-                if state == "":
-                    transitions["λ"] = transition
-                    del transitions[""]
-        return all_transitions
+        return frozendict({
+            state: frozendict({
+                "λ" if symbol == "" else symbol: next_states
+                for symbol, next_states in transitions.items()
+            }) if "" in transitions else transitions
+            for state, transitions in all_transitions.items()
+        })
+
+def _nfa_lambda_transitions(target_fa) -> dict:
+    """ The NFA's transitions with λ for lambda transitions, which
+    make_nfa_table builds once per machine """
+    return _nfa_add_lambda(all_transitions=target_fa.transitions)
  
 def make_DFA(states, input_symbols, transitions, initial_state, final_states, allow_partial=False): 
     return DFA(
@@ -198,13 +232,16 @@ def make_DFA(states, input_symbols, transitions, initial_state, final_states, al
     )
     
 def make_NFA(states, input_symbols, transitions, initial_state, final_states):
-    return NFA(
+    nfa = fa_helpers.NFA(
        states=states,
        input_symbols=input_symbols,
        transitions=transitions,
        initial_state=initial_state,
        final_states=final_states 
     )
+    # Closures and step masks are built here, once per machine
+    fa_helpers.compile_nfa(nfa)
+    return nfa
     
 def make_DTM(states, input_symbols, tape_symbols, transitions, initial_state, blank_symbol, final_states):
     dtm = DTM(
@@ -221,6 +258,8 @@ def make_DTM(states, input_symbols, tape_symbols, transitions, initial_state, bl
     
 def open(filename): 
     if str(filename).lower().endswith(('.png', '.jpg', '.jpeg', '.svg', '.pdf')):
+        # A diagram still being drawn to the file has to be finished first
+        render_queue.wait(filename)
         try:
             if platform.system() == 'Darwin':       # macOS
                 subprocess.check_call(('open', filename), stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
@@ -242,11 +281,11 @@ def save(*args):
     input_string = args[2]
     if len(args) > 3:
       horizontal = args[3]
-      return target_fa.show_diagram(input_str=input_string, path=path, horizontal=horizontal)
+      return render_queue.submit(target_fa, path, input_str=input_string, horizontal=horizontal)
     else:
-      return target_fa.show_diagram(input_str=input_string, path=path)
+      return render_queue.submit(target_fa, path, input_str=input_string)
   else:
-      return target_fa.show_diagram(path=path)
+      return render_queue.submit(target_fa, path)
   
 def test(*args):
     target_fa = args[0]
@@ -276,6 +315,106 @@ def test(*args):
     #    
     #return return_string 
 
+def limit(*args):
+    """
+    Sets how far runs of a DTM may go before they are stopped.
+
+    Args:
+        args[0]: The VisualDTM to limit.
+        args[1]: Most steps a run may take; 0 for no limit. Optional.
+        args[2]: Most tape cells a run may visit; 0 for no limit. Optional.
+
+    Returns:
+        str: The budgets the DTM now runs with.
+    """
+    target_fa = args[0]
+    if not isinstance(target_fa, tm_helpers.VisualDTM):
+        raise TypeError(f"limit() can only be called on a DTM, not {type(target_fa)}.")
+
+    if len(args) > 1:
+        target_fa.max_steps = _budget(args[1])
+    if len(args) > 2:
+        target_fa.max_tape = _budget(args[2])
+
+    max_steps, max_tape = target_fa.limits
+    return "Runs take {} steps and {} tape cells.".format(
+        "any number of" if max_steps is None else f"at most {max_steps}",
+        "any number of" if max_tape is None else f"at most {max_tape}",
+    )
+
+def _budget(value) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise TypeError(f"{value} is {type(value)}, not a whole number of at least 0.")
+    return value
+
+# Below this many words NumPy's per-call overhead outweighs the lockstep run
+VECTORIZE_THRESHOLD = 256
+
+def accepts_all(*args):
+    """
+    Tests every word against one machine, skipping the walkthrough tables.
+
+    Args:
+        args[0]: The DFA, NFA or VisualDTM to test.
+        args[1:]: Words to test. Each can be a string, a tuple or set of
+            strings, or a path to a .txt file holding one word per line.
+
+    Returns:
+        dict: Each word mapped to True if accepted, False if rejected. A
+            DTM run stopped before it halted maps to why it was stopped.
+    """
+    target_fa = args[0]
+    words = _collect_words(args[1:])
+
+    if isinstance(target_fa, DFA):
+        if len(words) >= VECTORIZE_THRESHOLD:
+            return fa_helpers.compile_dfa(target_fa).accepts_all(words)
+        return _dfa_accepts_all(target_fa, words)
+    elif isinstance(target_fa, NFA):
+        return fa_helpers.compile_nfa(target_fa).accepts_all(words)
+    elif isinstance(target_fa, tm_helpers.VisualDTM):
+        return {word: _dtm_verdict(target_fa.run(word)) for word in words}
+
+def _dtm_verdict(result: tm_helpers.DTMResult):
+    if result.stopped:
+        return f"Stopped: {result.stopped}"
+    return result.accepted
+
+def _collect_words(arguments) -> list:
+    words = []
+    for argument in arguments:
+        if isinstance(argument, str) and argument.lower().endswith('.txt'):
+            with builtins.open(argument, "r") as word_file:
+                words.extend(line.rstrip("\r\n") for line in word_file)
+        elif isinstance(argument, str):
+            words.append(argument)
+        elif isinstance(argument, (tuple, set, frozenset, list)):
+            words.extend(_collect_words(argument))
+        else:
+            raise TypeError(f"{argument} is {type(argument)}, not a word or collection of words.")
+    return words
+
+def _dfa_accepts_all(target_fa, words: list) -> dict:
+    # Plain dicts and locals keep the per-symbol step to one lookup; a
+    # missing transition or unknown symbol rejects the word
+    transitions = {
+        state: dict(target_fa.transitions.get(state, {}))
+        for state in target_fa.states
+    }
+    final_states = target_fa.final_states
+    initial_state = target_fa.initial_state
+    results = {}
+
+    for word in words:
+        state = initial_state
+        for symbol in word:
+            state = transitions[state].get(symbol)
+            if state is None:
+                break
+        results[word] = state in final_states
+
+    return results
+
 #https://github.com/lewiuberg/visual-automata/blob/master/visual_automata/fa/dfa.py
 def _make_dfa_transition_walkthrough(target_fa, input_str: str, return_result=False) -> Union[bool, list, list]:
         """
@@ -294,17 +433,10 @@ def _make_dfa_transition_walkthrough(target_fa, input_str: str, return_result=Fa
         if not isinstance(input_str, str):
             raise TypeError(f"input_str should be a string. {input_str} is {type(input_str)}, not a string.")
 
-        current_state = target_fa.initial_state
-        transitions_taken = [current_state]
-        symbol_sequence: list = []
+        transitions_taken = fa_helpers.compile_dfa(target_fa).trace(input_str)
+        symbol_sequence: list = list(input_str)
         status: bool = True
 
-        for symbol in input_str:
-            symbol_sequence.append(symbol)
-            if symbol in target_fa.transitions[current_state]:
-                current_state = target_fa.transitions[current_state][symbol]
-            transitions_taken.append(current_state)
-
         if transitions_taken[-1] not in target_fa.final_states:
             status = False
         else:
@@ -330,13 +462,15 @@ def _make_dfa_transition_walkthrough(target_fa, input_str: str, return_result=Fa
             return taken_steps  # .to_string(index=False)
         
 #https://github.com/lewiuberg/visual-automata/blob/master/visual_automata/fa/dfa.py
-def _get_dfa_transition_steps(target_fa, initial_state, final_states, input_str: str, transitions_taken: list, status: bool) -> pd.DataFrame:
+def _get_dfa_transition_steps(target_fa, initial_state, final_states, input_str: str, transitions_taken: list, status: bool) -> trace_helpers.Trace:
     initial_state = target_fa.initial_state
     final_states = target_fa.final_states
     
     current_states = transitions_taken.copy()
     for i, state in enumerate(current_states):
-        if (
+        if state is None:
+            current_states[i] = "∅"
+        elif (
             state == initial_state and state in
             final_states
         ):
@@ -357,26 +491,13 @@ def _get_dfa_transition_steps(target_fa, initial_state, final_states, input_str:
         "New state:": new_states,
     }
 
-    transition_steps = pd.DataFrame.from_dict(
-        transition_steps
-    )
-    transition_steps.index += 1
-    transition_steps = pd.DataFrame.from_dict(
-        transition_steps
-    ).rename_axis("Step:", axis=1)
     if status:
-        transition_steps.columns = pd.MultiIndex.from_product(
-            [[f'[DFA on \"{input_str}\" is Accepted!]'], transition_steps.columns]
-        )
-        return transition_steps
+        return trace_helpers.Trace(f'[DFA on \"{input_str}\" is Accepted!]', transition_steps)
     else:
-        transition_steps.columns = pd.MultiIndex.from_product(
-            [[f'[DFA on \"{input_str}\" is Rejected...]'], transition_steps.columns]
-        )
-        return transition_steps
+        return trace_helpers.Trace(f'[DFA on \"{input_str}\" is Rejected...]', transition_steps)
 
 #https://github.com/lewiuberg/visual-automata/blob/master/visual_automata/fa/nfa.py    
-def _make_nfa_transition_walkthrough(target_fa, input_str: str, return_result=False) -> Union[bool, list, pd.DataFrame]:  # pragma: no cover. Too many possibilities.
+def _make_nfa_transition_walkthrough(target_fa, input_str: str, return_result=False) -> Union[bool, list, trace_helpers.Trace]:  # pragma: no cover. Too many possibilities.
         """
         Checks if string of input symbols results in final state.
 
@@ -397,16 +518,9 @@ def _make_nfa_transition_walkthrough(target_fa, input_str: str, return_result=Fa
                 f"{input_str} is {type(input_str)}, not a string."
             )
             
-        status = target_fa.accepts_input(input_str)
-            
         status, taken_transitions_pairs = _nfa_pathfinder(
-            target_fa, input_str=input_str, status=status
+            target_fa, input_str=input_str
         )
-        if not isinstance(status, bool):
-            if return_result:
-                return status, [], pd.DataFrame, input_str
-            else:
-                return status
         current_states = target_fa.initial_state
         transitions_taken = [current_states]
 
@@ -426,7 +540,7 @@ def _make_nfa_transition_walkthrough(target_fa, input_str: str, return_result=Fa
             return taken_steps
 
 #https://github.com/lewiuberg/visual-automata/blob/master/visual_automata/fa/nfa.py    
-def _get_nfa_transition_steps(initial_state, final_states, input_str: str, transitions_taken: list, status: bool) -> pd.DataFrame:  # pragma: no cover. Too many possibilities.
+def _get_nfa_transition_steps(initial_state, final_states, input_str: str, transitions_taken: list, status: bool) -> Tuple[trace_helpers.Trace, list]:  # pragma: no cover. Too many possibilities.
         """
         Generates a table of taken transitions based on the input string and it's result.
 
@@ -438,7 +552,7 @@ def _get_nfa_transition_steps(initial_state, final_states, input_str: str, trans
             status (bool): The result of the input string.
 
         Returns:
-            DataFrame: Table of taken transitions based on the input string and it's result.
+            Tuple[Trace, list]: Table of taken transitions based on the input string and it's result, and the input symbols it read.
         """
         current_states = transitions_taken.copy()
         for i, state in enumerate(current_states):
@@ -465,107 +579,35 @@ def _get_nfa_transition_steps(initial_state, final_states, input_str: str, trans
             "New state:": new_states,
         }
 
-        transition_steps = pd.DataFrame.from_dict(transition_steps)
-        transition_steps.index += 1
-        transition_steps = pd.DataFrame.from_dict(
-            transition_steps
-        ).rename_axis("Step:", axis=1)
         if status:
-            transition_steps.columns = pd.MultiIndex.from_product(
-                [[f'[NFA on \"{input_str}\" is Accepted!]'], transition_steps.columns]
-            )
-            return transition_steps, inputs
+            return trace_helpers.Trace(f'[NFA on \"{input_str}\" is Accepted!]', transition_steps), inputs
         else:
-            transition_steps.columns = pd.MultiIndex.from_product(
-                [[f'[NFA on \"{input_str}\" is Rejected...]'], transition_steps.columns]
-            )
-            return transition_steps, inputs
+            return trace_helpers.Trace(f'[NFA on \"{input_str}\" is Rejected...]', transition_steps), inputs
         
-#https://github.com/lewiuberg/visual-automata/blob/master/visual_automata/fa/nfa.py        
-def _nfa_pathfinder(target_fa, input_str: str, status: bool = False, counter: int = 0, main_counter: int = 0) -> Union[bool, list]:  # pragma: no cover. Too many possibilities.
-        """
-        Searches for a appropriate path to return to input_check.
-
-        Args:
-            input_str (str): Input symbols
-            status (bool, optional): If a path is found. Defaults to False.
-            counter (int, optional): To keep track of recursion limit in __pathsearcher. Defaults to 0.
-            main_counter (int, optional): To keep track of recursion limit in _pathfinder. Defaults to 0.
-
-        Returns:
-            Union[bool, list]: If a path is found, and a list of transition tuples.
-        """
-
-        counter += 1
-        nfa = target_fa.copy()
-        recursion_limit = 50
-        result = _nfa_pathsearcher(nfa, input_str, status)
-
-        if result:
-            return status, result
-        else:
-            main_counter += 1
-            if main_counter <= recursion_limit:
-                return _nfa_pathfinder(
-                    input_str, status, counter, main_counter=main_counter
-                )
-            else:
-                status = (
-                    "[NO VALID PATH FOUND]\n"
-                    "Try to eliminate lambda transitions and try again.\n"
-                    "Example: nfa_lambda_removed = nfa.eliminate_lambda()"
-                )
-                return status, []
-
-#https://github.com/lewiuberg/visual-automata/blob/master/visual_automata/fa/nfa.py
-def _nfa_pathsearcher(nfa, input_str: str, status: bool = False, counter: int = 0) -> list:  # pragma: no cover. Too many possibilities.
+def _nfa_pathfinder(target_fa, input_str: str) -> Tuple[bool, list]:
         """
-        Searches for a appropriate path to return to _pathfinder.
+        Finds a witness path for input_str on the machine's CompiledNFA,
+        which steps whole sets of states as bitmasks and then walks back
+        through them for one run. Each step follows the lambda closure of
+        the state, the symbol, then the lambda closure of where it lands.
 
         Args:
-            nfa (VisualNFA): A VisualNFA object.
+            target_fa (NFA): The NFA to run.
             input_str (str): Input symbols.
-            status (bool, optional): If a path is found. Defaults to False.
-            counter (int, optional): To keep track of recursion limit. Defaults to 0.
 
         Returns:
-            list: a list of transition tuples.
+            Tuple[bool, list]: Whether input_str is accepted, and a list of
+                (from_state, to_state, symbol) transitions. An accepted word
+                gets a path to a final state; a rejected one gets the longest
+                path it can take, ending in {} if it gets stuck.
         """
+        status, states = fa_helpers.compile_nfa(target_fa).witness(input_str)
 
-        recursion_limit = 20000
-        counter += 1
-        current_state = {(nfa.initial_state)}
-        path = []
-        for symbol in input_str:
-            next_curr = nfa._get_next_current_states(current_state, symbol)
-            if next_curr == set():
-                if not status:
-                    state = {}
-                    path.append(("".join(current_state), state, symbol))
-                    return path
-                else:
-                    break
-            else:
-                state = random.choice(list(next_curr))
-            path.append(("".join(current_state), state, symbol))
-            current_state = {(state)}
-
-        # Accepted path opptained.
-        if (
-            status
-            and len(input_str) == (len(path))
-            and path[-1][1] in nfa.final_states
-        ):
-            return path
-        # Rejected path opptained.
-        elif not status and len(input_str) == (len(path)):
-            return path
-        # No path obtained. Try again.
-        else:
-            if counter <= recursion_limit:
-                return _nfa_pathsearcher(nfa, input_str, status, counter)
-            else:
-                return False
+        path = list(zip(states, states[1:], input_str))
+        read = len(path)
+        if read < len(input_str):
+            path.append((states[-1], {}, input_str[read]))
+        return status, path
             
 def _make_dtm_transition_walkthrough(target_fa, input_str: str, return_result=False) -> Union[bool, list, list]:
         """
@@ -589,37 +631,17 @@ def _make_dtm_transition_walkthrough(target_fa, input_str: str, return_result=Fa
         symbol_sequence: list = []
         status: bool = True
 
-        transitions_path, status = target_fa.get_input_path(input_str=input_str)
-        
-        for transition_index, configuration_pair in enumerate(
-                transitions_path, start=1
-            ):
-            
-            prev_configuration = configuration_pair[0]
-            configuration = configuration_pair[1]
-            
-            from_state = prev_configuration.state
-            to_state = configuration.state
-            
-            if configuration.tape.current_position > prev_configuration.tape.current_position:
-                direction = 'R'
-            elif configuration.tape.current_position < prev_configuration.tape.current_position:
-                direction = 'L'
-            else:
-                direction = 'N'
-                
-            if direction == 'R':
-                write_symbol = configuration.tape.tape[configuration.tape.current_position - 1]
-                read_symbol = prev_configuration.tape.tape[configuration.tape.current_position - 1]
-            elif direction == 'L':
-                write_symbol = configuration.tape.tape[configuration.tape.current_position + 1]
-                read_symbol = prev_configuration.tape.tape[configuration.tape.current_position + 1]
-            else: 
-                write_symbol = configuration.tape.tape[configuration.tape.current_position]
-                read_symbol = prev_configuration.tape.tape[configuration.tape.current_position]
-            
-            transition = target_fa.get_edge_name(read_symbol) + "/" + target_fa.get_edge_name(write_symbol) + "," + direction
-            transitions_taken.append((from_state, to_state, transition))
+        history = target_fa.record(input_str)
+        status, stopped = history.result.accepted, history.result.stopped
+
+        # A machine has few distinct transitions, so each step shares the
+        # tuple for its transition instead of building one
+        distinct_transitions: dict = {}
+        for step in history:
+            if step not in distinct_transitions:
+                transition = target_fa.get_edge_name(step.read_symbol) + "/" + target_fa.get_edge_name(step.write_symbol) + "," + step.direction
+                distinct_transitions[step] = (step.from_state, step.to_state, transition)
+            transitions_taken.append(distinct_transitions[step])
 
         taken_steps = _get_dtm_transition_steps(
             target_fa=target_fa.dtm,
@@ -628,42 +650,36 @@ def _make_dtm_transition_walkthrough(target_fa, input_str: str, return_result=Fa
             input_str=input_str,
             transitions_taken=transitions_taken,
             status=status,
+            stopped=stopped,
         )
         if return_result:
             return status, taken_steps
         else:
             return taken_steps  # .to_string(index=False)
         
-def _get_dtm_transition_steps(target_fa, initial_state, final_states, input_str: str, transitions_taken: list, status: bool) -> pd.DataFrame:
+def _get_dtm_transition_steps(target_fa, initial_state, final_states, input_str: str, transitions_taken: list, status: bool, stopped=None) -> trace_helpers.Trace:
     initial_state = target_fa.initial_state
     final_states = target_fa.final_states
     
-    current_states = transitions_taken.copy()
-    for i, state in enumerate(current_states):
-        if (state[0] == initial_state and state[0] in final_states):
-            current_states[i] = "→*" + state[0]
-        elif state[0] == initial_state:
-            current_states[i] = "→" + state[0]
-        elif state[0] in final_states:
-            current_states[i] = "*" + state[0]
-        else:
-            current_states[i] = state[0]
+    labels: dict = {}
+    def label(state):
+        if state not in labels:
+            if state == initial_state and state in final_states:
+                labels[state] = "→*" + state
+            elif state == initial_state:
+                labels[state] = "→" + state
+            elif state in final_states:
+                labels[state] = "*" + state
+            else:
+                labels[state] = state
+        return labels[state]
+
+    current_states = [label(transition[0]) for transition in transitions_taken]
     current_states.insert(0, "")
 
-    new_states = transitions_taken.copy()
-    for i, state in enumerate(new_states):
-        if (
-            state[1] == initial_state and state[1] in
-            final_states
-        ):
-            new_states[i] = "→*" + state[1]
-        elif state[1] == initial_state:
-            new_states[i] = "→" + state[1]
-        elif state[1] in final_states:
-            new_states[i] = "*" + state[1]
-        else:
-            new_states[i] = state[1]
-    new_states.insert(0, current_states[1])
+    new_states = [label(transition[1]) for transition in transitions_taken]
+    # Every run starts in the initial state, even one that takes no step
+    new_states.insert(0, label(initial_state))
             
     #del current_states[-1]
     #del new_states[0]
@@ -676,20 +692,9 @@ def _get_dtm_transition_steps(target_fa, initial_state, final_states, input_str:
         "New state:": new_states,
     }
 
-    transition_steps = pd.DataFrame.from_dict(
-        transition_steps
-    )
-    transition_steps.index += 1
-    transition_steps = pd.DataFrame.from_dict(
-        transition_steps
-    ).rename_axis("Step:", axis=1)
-    if status:
-        transition_steps.columns = pd.MultiIndex.from_product(
-            [[f'[DTM on \"{input_str}\" is Accepted!]'], transition_steps.columns]
-        )
-        return transition_steps
+    if stopped:
+        return trace_helpers.Trace(f'[DTM on \"{input_str}\" is Stopped: {stopped}]', transition_steps)
+    elif status:
+        return trace_helpers.Trace(f'[DTM on \"{input_str}\" is Accepted!]', transition_steps)
     else:
-        transition_steps.columns = pd.MultiIndex.from_product(
-            [[f'[DTM on \"{input_str}\" is Rejected...]'], transition_steps.columns]
-        )
-        return transition_steps
+        return trace_helpers.Trace(f'[DTM on \"{input_str}\" is Rejected...]', transition_steps)
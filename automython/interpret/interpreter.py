@@ -1,22 +1,121 @@
 #!/usr/bin/env python
+import argparse
+import os
 import sys
+import time
+import interpret.batch as batch
 import interpret.cli as cli
 import interpret.file_interface as file
+import interpret.tm_helpers as tm_helpers
+import interpret.startup_profile as startup_profile
+import interpret.compiler as compiler
+import interpret.render_cache as render_cache
+import interpret.render_overlay as render_overlay
+import interpret.render_queue as render_queue
+
+def budget(value):
+  """ A step or tape budget from the command line; 0 means no limit """
+  try:
+    number = int(value)
+  except ValueError:
+    number = -1
+  if number < 0:
+    raise argparse.ArgumentTypeError('{} is not a whole number of at least 0'.format(value))
+  return number or None
+
+def jobs(value):
+  """ A number of render processes from the command line, at least 1 """
+  try:
+    number = int(value)
+  except ValueError:
+    number = 0
+  if number < 1:
+    raise argparse.ArgumentTypeError('{} is not a whole number of at least 1'.format(value))
+  return number
+
+def parse_arguments(arguments):
+  parser = argparse.ArgumentParser(prog='automython')
+  parser.add_argument('files', nargs='*', metavar='file',
+                      help='.theory file to run; starts the interactive prompt if left out. '
+                           'Several files, directories of them or glob patterns run side by side, '
+                           'each in a process of its own')
+  parser.add_argument('--jobs', type=jobs, default=os.cpu_count() or 1, metavar='N',
+                      help='scripts run at once when several are given (default: %(default)s)')
+  parser.add_argument('--timeout', type=budget, default=300, metavar='SECONDS',
+                      help='seconds each of several scripts may run before it is stopped, '
+                           '0 for no limit (default: %(default)s)')
+  parser.add_argument('--output-dir', metavar='DIR',
+                      help='write what each of several scripts prints to its own .out file in DIR '
+                           'instead of printing it as each one ends')
+  parser.add_argument('--max-steps', type=budget, default=tm_helpers.MAX_STEPS, metavar='N',
+                      help='steps a DTM run may take before it is stopped, 0 for no limit '
+                           '(default: %(default)s)')
+  parser.add_argument('--max-tape', type=budget, default=tm_helpers.MAX_TAPE, metavar='N',
+                      help='tape cells a DTM run may use before it is stopped, 0 for no limit '
+                           '(default: %(default)s)')
+  parser.add_argument('--no-compile-cache', action='store_true',
+                      help='lex, parse and validate the whole file instead of running the '
+                           'compiled form an earlier run kept in __pycache__')
+  parser.add_argument('--no-render-cache', action='store_true',
+                      help='lay out and draw every diagram save() writes instead of '
+                           'reusing earlier renderings')
+  parser.add_argument('--overlay-paths', action='store_true',
+                      help='draw the path save() highlights over one layout of its machine '
+                           'instead of laying out every highlighted diagram anew')
+  parser.add_argument('--render-jobs', type=jobs, default=render_queue.WORKERS, metavar='N',
+                      help='processes save() draws diagrams in while the script keeps running; '
+                           '1 draws each diagram before save() returns (default: %(default)s)')
+  parser.add_argument('--startup-profile', action='store_true',
+                      help='run under python -X importtime and report the time spent importing '
+                           'modules to stderr')
+  return parser.parse_args(arguments)
+
+def configure(arguments):
+  """ Applies the settings on the command line to this process """
+  tm_helpers.MAX_STEPS = arguments.max_steps
+  tm_helpers.MAX_TAPE = arguments.max_tape
+  compiler.ENABLED = not arguments.no_compile_cache
+  render_cache.ENABLED = not arguments.no_render_cache
+  render_queue.WORKERS = arguments.render_jobs
+  render_overlay.ENABLED = arguments.overlay_paths
 
 def interpret(argv=sys.argv):
-  if len(argv) == 1:
+  arguments = parse_arguments(argv[1:])
+  if arguments.startup_profile:
+    sys.exit(startup_profile.profile([a for a in argv[1:] if a != '--startup-profile']))
+
+  configure(arguments)
+  if not arguments.files:
     cli.cli()
-  elif len(argv) == 2:
-    if argv[1].lower().endswith('.theory'):
-      file.interpret(argv[1])
-    else:
-      print('Wrong file type. Please pass in a .theory file, e.g.')
-      print('automython <file-name>.theory')
-      sys.exit(1)
+  elif len(arguments.files) > 1 or os.path.isdir(arguments.files[0]) or batch.is_pattern(arguments.files[0]):
+    run_batch(arguments)
+  elif arguments.files[0].lower().endswith('.theory'):
+    file.interpret(arguments.files[0])
   else:
-    print('Invalid command.')
+    print('Wrong file type. Please pass in a .theory file, e.g.')
+    print('automython <file-name>.theory')
     sys.exit(1)
 
+def run_batch(arguments):
+  """ Runs every script the command line names side by side, then
+  summarizes how each one went """
+  scripts = batch.find_scripts(arguments.files)
+  if not scripts:
+    print('No .theory files found in {}'.format(' '.join(arguments.files)))
+    sys.exit(1)
+  wrong = [script for script in scripts if not script.lower().endswith('.theory')]
+  if wrong:
+    wrong = ', '.join(os.path.relpath(script) for script in wrong)
+    print('Wrong file type: {}. Please pass in .theory files, e.g.'.format(wrong))
+    print('automython <file-name>.theory <other-file-name>.theory')
+    sys.exit(1)
+
+  started = time.perf_counter()
+  results = batch.run(scripts, arguments.jobs, arguments.timeout, arguments.output_dir,
+                      configure, arguments)
+  print(batch.summary(results, time.perf_counter() - started, arguments.jobs))
+  sys.exit(0 if all(result.status == 'ok' for result in results) else 1)
+
 def main(filename=None):
   if not filename:
     cli.cli()
@@ -24,12 +123,4 @@ def main(filename=None):
     file.interpret(filename)
     
 if __name__ == '__main__':
-    if len(sys.argv) == 1:
-      main()
-    elif len(sys.argv) == 2:
-      if sys.argv[1].lower().endswith('.theory'):
-        main(sys.argv[1])
-      else:
-        sys.exit(1)
-    else:
-      sys.exit(1)
\ No newline at end of file
+    interpret()
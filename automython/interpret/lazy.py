@@ -0,0 +1,53 @@
+"""
+Modules imported the first time they are used rather than at startup.
+
+pandas, IPython, numpy, coloraide and pygraphviz account for most of the
+interpreter's startup time, yet a script only needs them once it shows a
+table, runs a machine or draws a diagram.
+"""
+import importlib
+import sys
+from types import ModuleType
+
+class LazyModule:
+    """
+    Stands in for the module `name`, importing it the first time one of
+    its attributes is looked up. Until then nothing is imported, so an
+    optional module that is missing only fails where it is used.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._load(), attribute)
+
+    def __repr__(self) -> str:
+        return "<lazy module {!r}>".format(self._name)
+
+def available(module: LazyModule) -> bool:
+    """Whether `module` can be imported, importing it to find out."""
+    try:
+        module._load()
+    except ImportError:
+        return False
+    return True
+
+def display(*objs) -> None:
+    """
+    IPython's display(). Outside of an IPython shell it only prints the
+    objects, so IPython is not imported at all unless a shell may be
+    running, i.e. unless something has imported it already.
+    """
+    if "IPython" not in sys.modules:
+        print(*objs)
+        return
+
+    from IPython.display import display as ipython_display
+    ipython_display(*objs)
@@ -0,0 +1,266 @@
+"""
+An on-disk cache of rendered diagrams, so save() only runs a Graphviz
+layout for a machine, input string and set of options it has not drawn
+before.
+
+Each entry is a drawn file, named by a hash of everything that decides
+what the diagram looks like plus its format, next to the laid-out graph
+as DOT text, which rebuilds the AGraph save() returns. The least recently
+used entries are removed once the cache grows past MAX_BYTES.
+
+Saving to .dot or .gv skips Graphviz altogether and writes the graph as
+built, and the last few layouts are kept in memory, so drawing a diagram
+again in another format, e.g. an SVG next to a PNG, reuses its layout.
+With render_overlay enabled, highlighted paths reuse the layout of their
+machine with no input as well.
+"""
+import hashlib
+import json
+import os
+import pathlib
+import shutil
+from collections import Counter, OrderedDict
+from typing import (
+    Any,
+    Dict,
+    Optional,
+    Union,
+)
+
+import interpret.cache_files as cache_files
+import interpret.fa_helpers as fa_helpers
+import interpret.lazy as lazy
+import interpret.render_overlay as render_overlay
+import interpret.tm_helpers as tm_helpers
+import interpret.utils as utils
+
+pgv = lazy.LazyModule("pygraphviz")
+
+# Part of every key, so entries drawn by an older layout are not reused
+CACHE_VERSION = 2
+
+# Whether drawn diagrams are looked up and kept; --no-render-cache clears
+# it, so every save() runs Graphviz
+ENABLED = True
+
+MAX_BYTES = 256 * 1024 * 1024
+
+# Files saved as the DOT source of the graph, which need no layout
+DOT_SUFFIXES = (".dot", ".gv")
+
+# Laid-out graphs kept in memory, by cache key, for other formats
+LAYOUTS_KEPT = 16
+_layouts: "OrderedDict[str, pgv.AGraph]" = OrderedDict()
+
+# Bytes of images in each cache directory as of its last scan, plus what
+# this process has stored there since, so a miss only scans the directory
+# when the cache may have grown past MAX_BYTES
+_sizes: Dict[str, int] = {}
+
+# show_diagram's defaults, so a key does not depend on which of them
+# save() passed explicitly
+DEFAULT_OPTIONS = {
+    "layout_method": "dot",
+    "horizontal": True,
+    "reverse_orientation": False,
+    "fig_size": None,
+    "font_size": 14.0,
+    "arrow_size": 0.85,
+    "state_separation": 0.5,
+}
+
+def cache_directory() -> pathlib.Path:
+    """Where rendered diagrams are kept: AUTOMYTHON_CACHE_DIR if it is set,
+    else automython/renders under the user's cache directory."""
+    if os.environ.get("AUTOMYTHON_CACHE_DIR"):
+        return pathlib.Path(os.environ["AUTOMYTHON_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(base) / "automython" / "renders"
+
+def _canonical(value: Any) -> Any:
+    """`value` as JSON that is the same for equal machine definitions,
+    whatever order their sets and dicts were built in."""
+    if isinstance(value, dict):
+        return sorted(
+            ([_canonical(key), _canonical(item)] for key, item in value.items()),
+            key=json.dumps,
+        )
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical(element) for element in value), key=json.dumps)
+    if isinstance(value, (list, tuple)):
+        return [_canonical(element) for element in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return repr(value)
+
+def fingerprint(target_fa: Any) -> Any:
+    """
+    What a diagram of `target_fa` depends on: its type and definition, and
+    for a DTM the budgets that decide where a highlighted run stops.
+    """
+    if isinstance(target_fa, tm_helpers.VisualDTM):
+        return [
+            "DTM",
+            _canonical(target_fa.dtm.input_parameters),
+            _canonical(target_fa.limits),
+        ]
+    return [type(target_fa).__name__, _canonical(target_fa.input_parameters)]
+
+def cache_key(target_fa: Any, input_str: Optional[str], options: dict) -> str:
+    """The hash naming the layout of `target_fa` with these arguments, which
+    every format it is drawn in shares."""
+    key = [
+        CACHE_VERSION,
+        fingerprint(target_fa),
+        input_str,
+        _canonical({**DEFAULT_OPTIONS, **options}),
+    ]
+    return hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()
+
+def make_diagram(target_fa: Any, input_str: Optional[str] = None, **options) -> "pgv.AGraph":
+    """The graph show_diagram would draw for `target_fa`, not laid out."""
+    options.pop("layout_method", None)
+    if isinstance(target_fa, tm_helpers.VisualDTM):
+        return target_fa.make_diagram(input_str, **options)
+    return fa_helpers.make_diagram(target_fa, input_str, **options)
+
+def is_dot(path: Union[str, os.PathLike]) -> bool:
+    """Whether saving to `path` writes DOT source rather than a drawing."""
+    return pathlib.Path(path).suffix.lower() in DOT_SUFFIXES
+
+def _remember(key: str, graph: "pgv.AGraph") -> None:
+    _layouts[key] = graph
+    _layouts.move_to_end(key)
+    if len(_layouts) > LAYOUTS_KEPT:
+        _layouts.popitem(last=False)
+
+def layout(target_fa: Any, **options) -> "pgv.AGraph":
+    """
+    The diagram of `target_fa` with no input that render_overlay draws
+    paths over, laid out once and then kept in memory.
+    """
+    key = cache_key(target_fa, None, {**options, "overlay": True})
+    graph = _layouts.get(key)
+    if graph is None:
+        graph = make_diagram(target_fa, **options)
+        render_overlay.reserve_room(target_fa, graph)
+        graph.layout(prog=options.get("layout_method", DEFAULT_OPTIONS["layout_method"]))
+    _remember(key, graph)
+    return graph
+
+def _draw(target_fa: Any, path: Union[str, os.PathLike], input_str: Optional[str], options: dict) -> "pgv.AGraph":
+    """Lays out the diagram, or overlays its path on the machine's layout,
+    and saves it to `path`."""
+    if render_overlay.ENABLED and input_str is not None:
+        graph = render_overlay.overlay(target_fa, layout(target_fa, **options), input_str)
+        utils.save_graph(graph, path)
+        return graph
+    return target_fa.show_diagram(input_str=input_str, path=path, **options)
+
+def render(target_fa: Any, path: Union[str, os.PathLike], input_str: Optional[str] = None, **options):
+    """
+    Saves the diagram target_fa.show_diagram would draw to `path`, copying
+    it from the cache when it has been drawn before. A .dot or .gv path
+    gets the graph's DOT source, with no layout.
+
+    Returns:
+        AGraph: The diagram; laid out unless it was saved as DOT, and
+            rebuilt from the cache on a hit.
+    """
+    if is_dot(path):
+        graph = make_diagram(target_fa, input_str, **options)
+        graph.write(str(path))
+        return graph
+
+    if not ENABLED:
+        return _draw(target_fa, path, input_str, options)
+
+    directory = cache_directory()
+    if render_overlay.ENABLED and input_str is not None:
+        # Overlays look different from a layout of the highlighted graph
+        key = cache_key(target_fa, input_str, {**options, "overlay": True})
+    else:
+        key = cache_key(target_fa, input_str, options)
+    image = directory / (key + pathlib.Path(path).suffix.lower())
+    dot = directory / (key + ".gv")
+
+    try:
+        graph_string = dot.read_text(encoding="utf-8")
+        shutil.copyfile(image, path)
+    except OSError:
+        pass
+    else:
+        # Touched so eviction sees the entry as recently used
+        os.utime(image)
+        return pgv.AGraph(string=graph_string)
+
+    graph = _layouts.get(key)
+    if graph is None:
+        graph = _draw(target_fa, path, input_str, options)
+    else:
+        utils.save_graph(graph, path)
+    _remember(key, graph)
+
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        _store(path, image)
+        _store_text(graph.string(), dot)
+        _track(directory, image, MAX_BYTES)
+    except OSError:
+        # The cache only ever saves time; a directory that cannot be
+        # written to leaves every save() rendering as before
+        pass
+    return graph
+
+def _store(source: Union[str, os.PathLike], target: pathlib.Path) -> None:
+    """Copies the drawn file `source` into the cache as `target`."""
+    with open(source, "rb") as drawn, cache_files.AtomicFile(target) as file:
+        shutil.copyfileobj(drawn, file)
+
+def _store_text(text: str, target: pathlib.Path) -> None:
+    with cache_files.AtomicFile(target, "w", encoding="utf-8") as file:
+        file.write(text)
+
+def _track(directory: pathlib.Path, image: pathlib.Path, max_bytes: int) -> None:
+    """Counts the newly stored `image` towards the size of `directory`,
+    which is scanned the first time and whenever it may take more than
+    `max_bytes`. Entries other processes store are counted at the next
+    scan."""
+    total = _sizes.get(str(directory))
+    if total is not None:
+        total += image.stat().st_size
+    if total is None or total > max_bytes:
+        total = _evict(directory, max_bytes)
+    _sizes[str(directory)] = total
+
+def _evict(directory: pathlib.Path, max_bytes: int) -> int:
+    """Removes the least recently used entries until the rendered files
+    in `directory` take at most `max_bytes`, and returns what they take.
+    A key's DOT text goes with the last of its images, since every format
+    of the key reads it."""
+    images = []
+    formats = Counter()
+    total = 0
+    for entry in os.scandir(directory):
+        if entry.name.endswith((".gv", ".tmp")):
+            continue
+        stat = entry.stat()
+        images.append((stat.st_mtime, stat.st_size, entry.path))
+        formats[os.path.splitext(entry.path)[0]] += 1
+        total += stat.st_size
+
+    for _, size, image in sorted(images):
+        if total <= max_bytes:
+            break
+        stale = [image]
+        key = os.path.splitext(image)[0]
+        formats[key] -= 1
+        if not formats[key]:
+            stale.append(key + ".gv")
+        for path in stale:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        total -= size
+    return total
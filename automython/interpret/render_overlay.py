@@ -0,0 +1,193 @@
+"""
+Highlighted input paths drawn over one layout of their machine, so saving
+the run of many input strings lays the machine out only once.
+
+Each transition keeps the place it has in a diagram with no input, laid
+out with room for step numbers on every label; the ones a run takes are
+colored by the last step that took them and labelled with the numbers of
+their steps, instead of being drawn again as one new edge per step. The
+positions are passed to Graphviz as they are, like neato -n2 does, so
+only drawing is left to do.
+"""
+import html
+from collections import defaultdict
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+)
+
+import interpret.fa_helpers as fa_helpers
+import interpret.lazy as lazy
+import interpret.tm_helpers as tm_helpers
+
+coloraide = lazy.LazyModule("coloraide")
+pgv = lazy.LazyModule("pygraphviz")
+
+# Whether highlighted paths are drawn over their machine's layout rather
+# than laid out anew; --overlay-paths sets it
+ENABLED = False
+
+# Step numbers shown on a transition before the rest are left out
+STEPS_SHOWN = 3
+
+# Stands in for the step numbers while the machine is laid out, so there
+# is room for them next to every transition
+RESERVED = "#000, …, #00000 (0000×)"
+
+# Points per inch, the units of Graphviz positions and sizes
+POINTS = 72
+
+def _edge_transitions(
+    target_fa: Any,
+) -> Dict[Tuple[str, str], List[Tuple[Any, str]]]:
+    """
+    The transitions each edge of the diagram stands for, as the key a path
+    step names them by and their label, sorted by label as show_diagram
+    joins them.
+    """
+    edges = defaultdict(list)
+    if isinstance(target_fa, tm_helpers.VisualDTM):
+        for from_state, config, symbol in target_fa.iter_transitions():
+            to_state, write_symbol, direction = config
+            label = "{}/{},{}".format(
+                target_fa.get_edge_name(symbol),
+                target_fa.get_edge_name(write_symbol),
+                direction,
+            )
+            nodes = (
+                target_fa.get_state_name(from_state),
+                target_fa.get_state_name(to_state),
+            )
+            edges[nodes].append(((from_state, to_state, symbol), label))
+    else:
+        for from_state, to_state, symbol in target_fa.iter_transitions():
+            nodes = (
+                target_fa._get_state_name(from_state),
+                target_fa._get_state_name(to_state),
+            )
+            label = target_fa._get_edge_name(symbol)
+            edges[nodes].append(((from_state, to_state, symbol), label))
+
+    for transitions in edges.values():
+        transitions.sort(key=lambda transition: transition[1])
+    return dict(edges)
+
+def _path(
+    target_fa: Any, input_str: str
+) -> Tuple[List[Tuple[Any, Any, str]], bool]:
+    """The transitions the run on `input_str` takes, in order, and whether
+    it was accepted."""
+    if isinstance(target_fa, tm_helpers.VisualDTM):
+        history = target_fa.record(input_str)
+        steps = [
+            (step.from_state, step.to_state, step.read_symbol)
+            for step in history
+        ]
+        return steps, history.result.accepted
+    return target_fa._get_input_path(input_str=input_str)
+
+def _step_numbers(numbers: List[int]) -> str:
+    """The steps that took one transition, the first few and the last."""
+    if len(numbers) <= STEPS_SHOWN:
+        return ", ".join("#{}".format(number) for number in numbers)
+    shown = ", ".join(
+        "#{}".format(number) for number in numbers[: STEPS_SHOWN - 1]
+    )
+    return "{}, …, #{} ({}×)".format(shown, numbers[-1], len(numbers))
+
+def _label(label: str, steps: str) -> str:
+    return f"{html.escape(label, quote=False)} <b>[<i>{steps}</i>]</b>"
+
+def reserve_room(target_fa: Any, graph: "pgv.AGraph") -> None:
+    """
+    Makes room on each transition of `graph`, a diagram of `target_fa`
+    with no input that is yet to be laid out, for the step numbers of an
+    overlaid path.
+    """
+    transitions = fa_helpers.cached_for(target_fa, _edge_transitions)
+    for (from_node, to_node), edge_transitions in transitions.items():
+        labels = (_label(label, RESERVED) for _, label in edge_transitions)
+        edge = graph.get_edge(from_node, to_node)
+        edge.attr["label"] = "<" + ",".join(labels) + ">"
+
+def overlay(
+    target_fa: Any, base: "pgv.AGraph", input_str: str
+) -> "pgv.AGraph":
+    """
+    Draws the run of `input_str` over `base`, a laid-out diagram of
+    `target_fa` with no input and room reserved, which is left as it is.
+
+    Returns:
+        AGraph: A copy of `base` with the run highlighted, laid out with
+            the positions of `base`.
+    """
+    graph = pgv.AGraph(string=base.string())
+    steps, is_accepted = _path(target_fa, input_str)
+
+    start_color = coloraide.Color("#ff0")
+    end_color = coloraide.Color("#0f0" if is_accepted else "#f00")
+    interpolation = coloraide.Color.interpolate(
+        [start_color, end_color], space="srgb"
+    )
+    is_dtm = isinstance(target_fa, tm_helpers.VisualDTM)
+
+    taken = defaultdict(list)
+    for step_index, step in enumerate(steps, start=1):
+        taken[step].append(step_index)
+
+    transitions = fa_helpers.cached_for(target_fa, _edge_transitions)
+    for (from_node, to_node), edge_transitions in transitions.items():
+        labels = []
+        last_step = 0
+        for key, label in edge_transitions:
+            if key in taken:
+                labels.append(_label(label, _step_numbers(taken[key])))
+                last_step = max(last_step, taken[key][-1])
+            else:
+                labels.append(html.escape(label, quote=False))
+
+        edge = graph.get_edge(from_node, to_node)
+        edge.attr["label"] = "<" + ",".join(labels) + ">"
+        if last_step:
+            color = interpolation(last_step / len(steps))
+            edge.attr.update(
+                color=color.to_string(hex=True),
+                penwidth="1.5" if is_dtm else "2.5",
+            )
+
+    if is_dtm:
+        _fit_tape(target_fa, graph, input_str)
+    graph.layout(prog="nop2")
+    return graph
+
+def _fit_tape(
+    target_dtm: "tm_helpers.VisualDTM", graph: "pgv.AGraph", input_str: str
+) -> None:
+    """
+    Puts the initial tape in place of the tape symbols, growing it and its
+    box to the left, where it cannot run into the states.
+    """
+    tape = graph.get_node("tape")
+    cluster = graph.get_subgraph("cluster_tape")
+    old_width = float(tape.attr["width"]) * POINTS
+
+    blank = target_dtm.dtm.blank_symbol
+    # The same label make_diagram gives the initial tape
+    tape.attr["label"] = (
+        "{ $ | " + "|".join(input_str) + " | " + blank + " | ...}}"
+    )
+    cluster.graph_attr["label"] = "Initial Tape"
+    # Sizes the new tape, around its old center; everything may have been
+    # moved to keep the drawing at the origin, so positions are read after
+    graph.layout(prog="nop2")
+
+    x, y = map(float, tape.attr["pos"].split(","))
+    grown = float(tape.attr["width"]) * POINTS - old_width
+    tape.attr["pos"] = "{},{}".format(x - grown / 2, y)
+    left, bottom, right, top = map(float, cluster.graph_attr["bb"].split(","))
+    left -= grown
+    cluster.graph_attr["bb"] = "{},{},{},{}".format(left, bottom, right, top)
+    _, label_y = cluster.graph_attr["lp"].split(",")
+    cluster.graph_attr["lp"] = "{},{}".format((left + right) / 2, label_y)
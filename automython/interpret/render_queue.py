@@ -0,0 +1,139 @@
+"""
+save() calls queued as jobs on a process pool, so a script keeps running
+while Graphviz lays out its diagrams.
+
+A queued diagram is waited for before anything else writes or opens its
+file, when what save() returned is used, and before the script ends.
+One that failed is reported then, against the line of the save() that
+queued it, rather than raised from wherever the wait happens to be.
+"""
+import concurrent.futures
+import os
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import interpret.lazy as lazy
+import interpret.render_cache as render_cache
+import interpret.render_overlay as render_overlay
+import interpret.tm_helpers as tm_helpers
+
+pgv = lazy.LazyModule("pygraphviz")
+
+# Processes diagrams are drawn in, set by --render-jobs; with 1, each
+# save() draws its diagram before returning
+WORKERS = os.cpu_count() or 1
+
+_executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+# The line of the statement being run, which a job queued by it is
+# reported against if it fails; the file interpreter sets it
+line: Optional[int] = None
+
+# The latest queued job for each file, by absolute path, with the line of
+# the statement that queued it
+_pending: Dict[str, Tuple[concurrent.futures.Future, Optional[int]]] = {}
+
+def _render(target_fa: Any, path: str, input_str: Optional[str], options: dict, settings: tuple) -> str:
+    """Draws one diagram in a worker, with the budgets and render settings
+    the interpreter had when it was queued, and returns the graph as DOT."""
+    tm_helpers.MAX_STEPS, tm_helpers.MAX_TAPE, render_cache.ENABLED, render_overlay.ENABLED = settings
+    return render_cache.render(target_fa, path, input_str, **options).string()
+
+class DeferredRender:
+    """
+    What a queued save() returns: the diagram it will draw. Using it in any
+    way, printing it included, waits for the drawing and uses the AGraph
+    save() would have returned.
+    """
+
+    def __init__(self, future: concurrent.futures.Future):
+        self._future = future
+        self._graph = None
+
+    def result(self) -> "pgv.AGraph":
+        if self._graph is None:
+            self._graph = pgv.AGraph(string=self._future.result())
+        return self._graph
+
+    def __getattr__(self, attribute: str):
+        return getattr(self.result(), attribute)
+
+    def __str__(self) -> str:
+        return str(self.result())
+
+    def __repr__(self) -> str:
+        return repr(self.result())
+
+def submit(target_fa: Any, path: Union[str, os.PathLike], input_str: Optional[str] = None, **options):
+    """
+    Queues the diagram render_cache.render would save to `path`.
+
+    Returns:
+        DeferredRender: The diagram being drawn, or the AGraph itself when
+            it was saved in place, with WORKERS at 1 or as DOT source.
+    """
+    if WORKERS <= 1 or render_cache.is_dot(path):
+        # DOT source takes less time to write than to hand to a worker
+        wait(path)
+        return render_cache.render(target_fa, path, input_str, **options)
+
+    global _executor
+    if _executor is None:
+        _executor = concurrent.futures.ProcessPoolExecutor(WORKERS)
+
+    path = os.path.abspath(path)
+    # Two saves to one file must land in the order they were made
+    wait(path)
+    settings = (tm_helpers.MAX_STEPS, tm_helpers.MAX_TAPE, render_cache.ENABLED, render_overlay.ENABLED)
+    future = _executor.submit(_render, target_fa, path, input_str, options, settings)
+    _pending[path] = (future, line)
+    return DeferredRender(future)
+
+def wait(path: Union[str, os.PathLike, None] = None) -> None:
+    """
+    Blocks until the diagram queued for `path` is drawn, or every queued
+    diagram when no path is given, raising the error a drawing failed with.
+    """
+    if path is None:
+        jobs = list(_pending.values())
+        _pending.clear()
+    else:
+        job = _pending.pop(os.path.abspath(path), None)
+        jobs = [job] if job else []
+
+    for future, _ in jobs:
+        future.result()
+
+def finish() -> List[Tuple[Optional[int], Exception]]:
+    """
+    Blocks until every queued diagram is drawn.
+
+    Returns:
+        List[Tuple[Optional[int], Exception]]: The error each failed drawing
+            raised, with the line of the statement that queued it, in the
+            order they were queued.
+    """
+    jobs = list(_pending.values())
+    _pending.clear()
+
+    failures = []
+    for future, queued_at in jobs:
+        try:
+            future.result()
+        except Exception as ex:
+            failures.append((queued_at, ex))
+    return failures
+
+def report(failures: List[Tuple[Optional[int], Exception]]) -> None:
+    """Prints the errors finish() returned as the interpreter prints others."""
+    for queued_at, ex in failures:
+        where = "" if queued_at is None else " at line {}".format(queued_at)
+        print("An exception of type {0} occurred in save(){1}:\n{2}".format(
+            type(ex).__name__, where, ex
+        ))
@@ -0,0 +1,90 @@
+"""
+Where the interpreter's import time goes, read from the report Python
+writes with -X importtime.
+"""
+import os
+import subprocess
+import sys
+from typing import (
+    Iterable,
+    List,
+    NamedTuple,
+)
+
+PREFIX = "import time:"
+
+# Packages the interpreter imports lazily, and automata-lib, which
+# every machine needs
+HEAVY_PACKAGES = ["automata", "pandas", "numpy", "IPython", "coloraide", "pygraphviz"]
+
+class ImportTime(NamedTuple):
+    """One line of an -X importtime report, in microseconds."""
+    module: str
+    self_time: int
+    cumulative: int
+
+def parse(lines: Iterable[str]) -> List[ImportTime]:
+    """The imports an -X importtime report lists, in the order they finished."""
+    imports = []
+    for line in lines:
+        if not line.startswith(PREFIX):
+            continue
+        self_time, cumulative, name = line[len(PREFIX):].split("|")
+        if not self_time.strip().isdigit():
+            # The header line
+            continue
+        imports.append(ImportTime(name.strip(), int(self_time), int(cumulative)))
+    return imports
+
+def report(imports: List[ImportTime], top: int = 10) -> str:
+    """
+    The total import time, what each of HEAVY_PACKAGES took if it was
+    imported at all, and the modules that took longest by themselves.
+    """
+    total = sum(entry.self_time for entry in imports)
+    lines = ["Imports: {} modules in {:.1f} ms".format(len(imports), total / 1000)]
+
+    lines.append("Heavy packages, by the time of their own modules:")
+    for package in HEAVY_PACKAGES:
+        own = [
+            entry.self_time for entry in imports
+            if entry.module == package or entry.module.startswith(package + ".")
+        ]
+        if own:
+            lines.append("  {:<12}{:>9.1f} ms in {} modules".format(package, sum(own) / 1000, len(own)))
+        else:
+            lines.append("  {:<12}{:>12}".format(package, "not imported"))
+
+    lines.append("Slowest modules by their own time:")
+    for entry in sorted(imports, key=lambda entry: entry.self_time, reverse=True)[:top]:
+        lines.append("  {:>9.1f} ms  {}".format(entry.self_time / 1000, entry.module))
+    return "\n".join(lines)
+
+def profile(arguments: List[str]) -> int:
+    """
+    Runs the interpreter with `arguments` in a new Python under -X
+    importtime and prints a report of its imports to stderr once it ends.
+    The script's own output passes through unchanged.
+
+    Returns:
+        int: The exit status of the run.
+    """
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(
+        path for path in [package_root, environment.get("PYTHONPATH")] if path
+    )
+
+    run = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "interpret.interpreter", *arguments],
+        env=environment,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    lines = run.stderr.splitlines()
+    for line in lines:
+        if not line.startswith(PREFIX):
+            print(line, file=sys.stderr)
+
+    print(report(parse(lines)), file=sys.stderr)
+    return run.returncode
@@ -1,5 +1,6 @@
 import interpret.utils as utils
-import coloraide
+import interpret.lazy as lazy
+import array
 from automata.tm.dtm import DTM, DTMStateT, DTMPathResultT
 from automata.tm.configuration import TMConfiguration
 from automata.tm.tape import TMTape
@@ -7,17 +8,314 @@ import automata.base.exceptions as exceptions
 from typing import (
     Any,
     List,
+    NamedTuple,
     Tuple,
     Union,
     Optional,
     Generator,
+    Iterator,
 )
 from collections import defaultdict
 import os
 
+coloraide = lazy.LazyModule("coloraide")
+
+# Budgets a DTM run stops at unless a machine sets its own; None means
+# unbounded. The command line can change them for a whole run. Loops are
+# caught by cycle detection, so these only stop machines that keep going
+# without repeating themselves, such as 0^n1^n for n past about 700.
+MAX_STEPS: Optional[int] = 1_000_000
+# Each tape cell a run writes costs memory for the run and, in test(), for
+# every step it draws, so a machine that keeps extending its tape is
+# stopped here after about 0.3 seconds and 5 MiB of test(). accepts_all()
+# pays that once per word.
+MAX_TAPE: Optional[int] = 100_000
+
+
+class DTMResult(NamedTuple):
+    """How a CompiledDTM run ended."""
+    accepted: bool
+    steps: int
+    state: DTMStateT
+    tape: str
+    position: int
+    # Why the run was cut short, or None if the machine halted
+    stopped: Optional[str] = None
+
+
+class DTMStep(NamedTuple):
+    """One transition of a recorded DTM run."""
+    from_state: DTMStateT
+    to_state: DTMStateT
+    read_symbol: str
+    write_symbol: str
+    direction: str
+
+
+class DTMHistory:
+    """
+    A DTM run recorded as what changed at each step: the state it was in,
+    the head position, the symbol read, the symbol written and the move,
+    each kept in a flat array. That is a few bytes a step whatever the
+    tape's length; tapes are rebuilt from the input on demand.
+
+    Head positions count from the first input symbol, so cells left of
+    the input are negative.
+    """
+
+    def __init__(self, compiled: "CompiledDTM", input_str: str):
+        self.compiled = compiled
+        self.input_str = input_str
+        symbol_code = "B" if compiled.width <= 256 else "L"
+        # States are kept as table rows, state number * width
+        self.rows = array.array("q")
+        self.positions = array.array("q")
+        self.reads = array.array(symbol_code)
+        self.writes = array.array(symbol_code)
+        self.moves = array.array("b")
+        self.result: Optional[DTMResult] = None
+
+    def record(self, row: int, position: int, read: int, write: int, move: int) -> None:
+        self.rows.append(row)
+        self.positions.append(position)
+        self.reads.append(read)
+        self.writes.append(write)
+        self.moves.append(move)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def step(self, index: int) -> DTMStep:
+        """The transition taken at step index + 1."""
+        compiled = self.compiled
+        to_state = (
+            compiled.state_at(self.rows[index + 1])
+            if index + 1 < len(self.rows) else self.result.state
+        )
+        return DTMStep(
+            from_state=compiled.state_at(self.rows[index]),
+            to_state=to_state,
+            read_symbol=compiled.symbols[self.reads[index]],
+            write_symbol=compiled.symbols[self.writes[index]],
+            direction="LNR"[self.moves[index] + 1],
+        )
+
+    def __iter__(self) -> Iterator[DTMStep]:
+        return (self.step(index) for index in range(len(self)))
+
+    def tape_at(self, steps: int) -> TMTape:
+        """The tape after the first `steps` steps, as a TMTape holds it."""
+        compiled = self.compiled
+        blank = compiled.symbols[compiled.blank]
+        cells = dict(enumerate(self.input_str or blank))
+        lowest, highest = 0, len(cells) - 1
+
+        head = 0
+        for index in range(steps):
+            cells[self.positions[index]] = compiled.symbols[self.writes[index]]
+            head = self.positions[index] + self.moves[index]
+            lowest, highest = min(lowest, head), max(highest, head)
+
+        return TMTape(
+            [cells.get(i, blank) for i in range(lowest, highest + 1)],
+            blank_symbol=blank,
+            current_position=head - lowest,
+        )
+
+
+class CompiledDTM:
+    """
+    A DTM with its states and tape symbols numbered and its transitions in
+    one flat list indexed by state * width + symbol, run on a mutable tape.
+
+    Nothing is kept per step, so a run needs memory only for the tape
+    cells the head visits, however many steps it takes.
+    """
+
+    # Tape grows by at least this many cells when the head runs off an end
+    GROWTH = 64
+
+    def __init__(self, dtm: DTM):
+        self.states: List[DTMStateT] = sorted(dtm.states, key=str)
+        state_index = {state: i for i, state in enumerate(self.states)}
+        self.symbols: List[str] = sorted(dtm.tape_symbols)
+        self.symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.blank = self.symbol_index[dtm.blank_symbol]
+
+        # An extra column for symbols outside the tape alphabet, which
+        # have no transitions and so halt the machine
+        self.width = len(self.symbols) + 1
+        moves = {"L": -1, "N": 0, "R": 1}
+        self.table: List[Optional[Tuple[int, int, int]]] = [None] * (len(self.states) * self.width)
+        for from_state, lookup in dtm.transitions.items():
+            row = state_index[from_state] * self.width
+            for symbol, (to_state, write_symbol, direction) in lookup.items():
+                self.table[row + self.symbol_index[symbol]] = (
+                    state_index[to_state] * self.width,
+                    self.symbol_index[write_symbol],
+                    moves[direction],
+                )
+
+        self.initial = state_index[dtm.initial_state] * self.width
+        self.final = [state in dtm.final_states for state in self.states]
+        # One byte per cell whenever the alphabet allows it
+        self.make_tape = bytearray if self.width <= 256 else list
+
+    def state_at(self, row: int) -> DTMStateT:
+        """The state whose transitions start at table[row]."""
+        return self.states[row // self.width]
+
+    def run(
+        self,
+        input_str: str,
+        max_steps: Optional[int] = None,
+        max_tape: Optional[int] = None,
+        history: Optional[DTMHistory] = None,
+    ) -> DTMResult:
+        """
+        Runs the machine on input_str until no transition applies, it
+        takes max_steps steps, the head has visited more than max_tape
+        cells, or it repeats a configuration and so can never halt.
+
+        Repeats are found Brent-style: the configuration is saved at steps
+        that double in distance, and each step checks state and head
+        position against it before comparing tapes.
+
+        Parameters
+        ----------
+        input_str : str
+            The input string to write on the tape.
+        max_steps : Optional[int], default: None
+            Most steps to take; None for no limit.
+        max_tape : Optional[int], default: None
+            Most tape cells the head may visit; None for no limit.
+        history : Optional[DTMHistory], default: None
+            Records every step taken, if given.
+
+        Returns
+        ------
+        DTMResult
+            Whether the machine halted in a final state, the number of
+            transitions taken, the state it stopped in, the tape and head
+            position as a TMTape would hold them, and why it was stopped
+            if it did not halt.
+        """
+        unknown = self.width - 1
+        blank = self.blank
+        table = self.table
+        tape = self.make_tape(self.symbol_index.get(symbol, unknown) for symbol in input_str)
+        if not tape:
+            tape.append(blank)
+
+        # Cells [lowest, highest] are the ones a TMTape would have; the
+        # input starts at cell origin
+        origin = 0
+        lowest, highest = 0, len(tape) - 1
+        position = 0
+        state = self.initial
+        steps = 0
+        stopped = None
+
+        # The configuration is saved at every checkpoint, and checkpoints
+        # double in distance; max_steps is always a checkpoint too. Only
+        # checkpoints copy the tape, so a run makes O(log steps) copies.
+        saved_state, saved_position, saved_tape = state, position, tape[:]
+        save_every = 1
+        record = history.record if history is not None else None
+        checkpoint = 1 if max_steps is None else min(1, max_steps)
+
+        while True:
+            if steps == checkpoint:
+                if steps == max_steps:
+                    if table[state + tape[position]] is not None:
+                        stopped = "does not halt within {} steps".format(steps)
+                    break
+                saved_state, saved_position, saved_tape = state, position, tape[:]
+                save_every *= 2
+                checkpoint = steps + save_every
+                if max_steps is not None:
+                    checkpoint = min(checkpoint, max_steps)
+
+            transition = table[state + tape[position]]
+            if transition is None:
+                break
+            if record:
+                record(state, position - origin, tape[position], transition[1], transition[2])
+            state, tape[position], move = transition
+            position += move
+            steps += 1
+
+            if lowest <= position <= highest:
+                if state == saved_state and position == saved_position and tape == saved_tape:
+                    stopped = "cycle detected at step {}".format(steps)
+                    break
+                continue
+
+            if position < lowest:
+                lowest = position
+            else:
+                highest = position
+            if max_tape is not None and highest - lowest >= max_tape:
+                stopped = "tape exceeds {} cells at step {}".format(max_tape, steps)
+                break
+            if position < 0:
+                pad = max(len(tape), self.GROWTH)
+                tape[0:0] = self.make_tape([blank] * pad)
+                position += pad
+                lowest += pad
+                highest += pad
+                origin += pad
+            elif position == len(tape):
+                tape.extend([blank] * max(len(tape), self.GROWTH))
+            # The head is on a cell no earlier configuration reached, so
+            # none of them can repeat; the next checkpoint saves a new one
+            saved_state = None
+
+        # Cells holding a symbol outside the alphabet were never written
+        # to, so they still hold the input's symbol
+        cells = [
+            self.symbols[cell] if cell != unknown else input_str[i - origin]
+            for i, cell in enumerate(tape[lowest:highest + 1], start=lowest)
+        ]
+        result = DTMResult(
+            accepted=stopped is None and self.final[state // self.width],
+            steps=steps,
+            state=self.state_at(state),
+            tape="".join(cells),
+            position=position - lowest,
+            stopped=stopped,
+        )
+        if history is not None:
+            history.result = result
+        return result
+
+    def accepts_input(self, input_str: str) -> bool:
+        return self.run(input_str).accepted
+
+
 class VisualDTM:
     def __init__(self, dtm):
         self.dtm = dtm
+        self.compiled = CompiledDTM(dtm)
+        # This machine's own budgets; 0 lifts a limit and None falls back
+        # to MAX_STEPS/MAX_TAPE
+        self.max_steps: Optional[int] = None
+        self.max_tape: Optional[int] = None
+
+    @property
+    def limits(self) -> Tuple[Optional[int], Optional[int]]:
+        """The step and tape budgets runs of this machine stop at."""
+        return (
+            (MAX_STEPS if self.max_steps is None else self.max_steps) or None,
+            (MAX_TAPE if self.max_tape is None else self.max_tape) or None,
+        )
+
+    def run(self, input_str: str) -> DTMResult:
+        """Runs input_str on the compiled machine, keeping no history."""
+        return self.compiled.run(input_str, *self.limits)
+
+    def accepts_input(self, input_str: str) -> bool:
+        return self.run(input_str).accepted
         
     def __repr__(self):
         return str(self.dtm)
@@ -54,37 +352,33 @@ class VisualDTM:
     def get_edge_name(self, symbol: str) -> str:
             return "ε" if symbol == "" else str(symbol)
 
+    def record(self, input_str: str) -> DTMHistory:
+        """Runs input_str on the compiled machine, recording every step."""
+        history = DTMHistory(self.compiled, input_str)
+        self.compiled.run(input_str, *self.limits, history=history)
+        return history
+
     def get_input_path(
             self, input_str: str
-        ) -> Tuple[List[Tuple[DTMStateT, DTMStateT, utils.DTMSymbolT]], bool]:
+        ) -> Tuple[List[DTMStep], bool]:
             """
-            Calculate the path taken by input.
+            Calculate the path taken by input, within this machine's step
+            and tape budgets.
 
             Parameters
             ------
             input_str : str
-                The input string to run on the DFA.
+                The input string to run on the DTM.
 
             Returns
             ------
-            Tuple[List[Tuple[DFAStateT, DFAStateT, DFASymbolT], bool]]
-                A list of all transitions taken in each step and a boolean
-                indicating whether the DFA accepted the input.
+            Tuple[List[DTMStep], bool]
+                The transition taken in each step and a boolean indicating
+                whether the DTM accepted the input.
 
             """
-
-            state_history = list(self.read_input_stepwise(input_str, ignore_rejection=True))
-            state_history.pop()
-
-
-            path = []
-            for state_pair in zip(utils.pairwise(state_history)):
-                path.append(state_pair[0])
-
-            last_state = state_history[-1].state if state_history else self.dtm.initial_state
-            accepted = last_state in self.dtm.final_states
-
-            return path, accepted
+            history = self.record(input_str)
+            return list(history), history.result.accepted
         
     def _get_transition(
         self, state: DTMStateT, tape_symbol: str
@@ -184,6 +478,40 @@ class VisualDTM:
         arrow_size: float = 0.85,
         state_separation: float = 0.5,
     ):
+        graph = self.make_diagram(
+            input_str,
+            horizontal=horizontal,
+            reverse_orientation=reverse_orientation,
+            fig_size=fig_size,
+            font_size=font_size,
+            arrow_size=arrow_size,
+            state_separation=state_separation,
+        )
+
+        # Set layout
+        graph.layout(prog=layout_method)
+
+        # Write diagram to file
+        if path is not None:
+            utils.save_graph(graph, path)
+
+        return graph
+
+    def make_diagram(
+        self,
+        input_str: Optional[str] = None,
+        *,
+        horizontal: bool = True,
+        reverse_orientation: bool = False,
+        fig_size: Union[Tuple[float, float], Tuple[float], None] = None,
+        font_size: float = 14.0,
+        arrow_size: float = 0.85,
+        state_separation: float = 0.5,
+    ):
+        """
+        Builds the graph show_diagram draws, without laying it out, for
+        output that only needs the DOT source.
+        """
 
         # Defining the graph.
         graph = utils.create_graph(
@@ -219,13 +547,8 @@ class VisualDTM:
 
         is_edge_drawn = defaultdict(lambda: False)
         if input_str is not None:
-            #try:
-            input_path, is_accepted = self.get_input_path(input_str=input_str)
-            #except Exception as ex:
-            #    template = "An exception of type {0} occurred:\n{1!r}"
-            #    message = template.format(type(ex).__name__, ex.args[0])
-            #    print(message)
-            #    return None
+            history = self.record(input_str)
+            is_accepted = history.result.accepted
 
             start_color = coloraide.Color("#ff0")
             end_color = (
@@ -236,47 +559,21 @@ class VisualDTM:
             )
 
             # find all transitions in the finite state machine with traversal.
-            for transition_index, configuration_pair in enumerate(
-                input_path, start=1
-            ):
-
-                prev_configuration = configuration_pair[0]
-                configuration = configuration_pair[1]
-                color = interpolation(transition_index / len(input_path))
-
-                from_state = prev_configuration.state
-                to_state = configuration.state
-
-                if configuration.tape.current_position > prev_configuration.tape.current_position:
-                    direction = 'R'
-                elif configuration.tape.current_position < prev_configuration.tape.current_position:
-                    direction = 'L'
-                else:
-                    direction = 'N'
+            for transition_index, step in enumerate(history, start=1):
+                color = interpolation(transition_index / len(history))
 
-                if direction == 'R':
-                    write_symbol = configuration.tape.tape[configuration.tape.current_position - 1]
-                    read_symbol = prev_configuration.tape.tape[configuration.tape.current_position - 1]
-                elif direction == 'L':
-                    write_symbol = configuration.tape.tape[configuration.tape.current_position + 1]
-                    read_symbol = prev_configuration.tape.tape[configuration.tape.current_position + 1]
-                else: 
-                    write_symbol = configuration.tape.tape[configuration.tape.current_position]
-                    read_symbol = prev_configuration.tape.tape[configuration.tape.current_position]
+                label = self.get_edge_name(step.read_symbol) + "/" + self.get_edge_name(step.write_symbol) + "," + step.direction
 
-                label = self.get_edge_name(read_symbol) + "/" + self.get_edge_name(write_symbol) + "," + direction
-
-                is_edge_drawn[from_state, to_state, read_symbol] = True
+                is_edge_drawn[step.from_state, step.to_state, step.read_symbol] = True
                 graph.add_edge(
-                    self.get_state_name(from_state),
-                    self.get_state_name(to_state),
+                    self.get_state_name(step.from_state),
+                    self.get_state_name(step.to_state),
                     label=f"<{label} <b>[<i>#{transition_index}</i>]</b>>",
                     arrowsize=arrow_size_str,
                     fontsize=font_size_str,
                     color=color.to_string(hex=True),
                     penwidth="1.5",
                 )
-                prev_configuration = configuration
             # Create a subgraph for the tape
             subgraph = graph.add_subgraph(name='cluster_tape', label='Initial Tape', pos='0,0!', rank='same')
 
@@ -310,11 +607,4 @@ class VisualDTM:
                 fontsize=font_size_str,
             )
 
-        # Set layout
-        graph.layout(prog=layout_method)
-
-        # Write diagram to file
-        if path is not None:
-            utils.save_graph(graph, path)
-
         return graph
\ No newline at end of file
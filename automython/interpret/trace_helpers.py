@@ -0,0 +1,147 @@
+import interpret.lazy as lazy
+
+import shutil
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+)
+
+pd = lazy.LazyModule("pandas")
+
+# pandas' display defaults for a terminal, which the plain text rendering
+# follows so a Trace prints exactly like the DataFrame it stands for
+MAX_ROWS = 60
+MIN_ROWS = 10
+MAX_COLWIDTH = 50
+
+class Trace:
+    """
+    A walkthrough table held as plain columns of strings: a title over
+    every column, the name of the step numbers, and one list per column,
+    rows numbered from 1.
+
+    Printing it renders the text pandas would print for the equivalent
+    DataFrame without building one. to_frame() builds the DataFrame, which
+    IPython front ends get through _repr_html_.
+    """
+
+    def __init__(self, title: str, columns: Dict[str, List[Any]], index_name: str = "Step:"):
+        self.title = title
+        self.index_name = index_name
+        self.names = list(columns)
+        self.columns = list(columns.values())
+
+    def __len__(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def to_frame(self) -> "pd.DataFrame":
+        """The walkthrough as the DataFrame test() used to build."""
+        frame = pd.DataFrame.from_dict(dict(zip(self.names, self.columns)))
+        frame.index += 1
+        frame = frame.rename_axis(self.index_name, axis=1)
+        frame.columns = pd.MultiIndex.from_product([[self.title], frame.columns])
+        return frame
+
+    def _repr_html_(self) -> str:
+        return self.to_frame()._repr_html_()
+
+    def __repr__(self) -> str:
+        return self.to_string()
+
+    def __str__(self) -> str:
+        return self.to_string()
+
+    def to_string(self) -> str:
+        """
+        Renders the table the way repr() of to_frame() does in a terminal:
+        long tables keep their first and last five rows, and a table wider
+        than the terminal keeps its first and last columns.
+        """
+        rows = len(self)
+        if rows > MAX_ROWS:
+            half = MIN_ROWS // 2
+            shown_rows = list(range(half)) + list(range(rows - half, rows))
+        else:
+            half = None
+            shown_rows = list(range(rows))
+
+        plain = all(isinstance(column[row], str) for column in self.columns for row in shown_rows)
+        if not rows or len(self.columns) < 2 or not plain:
+            # Shapes pandas lays out differently are left to pandas
+            return repr(self.to_frame())
+
+        string_columns = self._string_columns(shown_rows, range(len(self.columns)), half)
+        widest = max(len(line) for line in _adjoin(string_columns))
+
+        # Drop middle columns until the rest fit the terminal, keeping at
+        # least two; the step numbers count as a column here
+        width, _ = shutil.get_terminal_size()
+        overflow = widest - width + 1
+        lengths = [max(len(value) for value in column) for column in string_columns]
+        while overflow > 0 and len(lengths) > 1:
+            overflow -= lengths.pop(round(len(lengths) / 2)) + 1
+        truncate_columns = len(self.columns) > max(len(lengths) - 1, 2)
+
+        if truncate_columns:
+            shown_columns = [0, len(self.columns) - 1]
+            string_columns = self._string_columns(shown_rows, shown_columns, half, dots_column=True)
+
+        text = "\n".join(_adjoin(string_columns))
+        if half is not None or truncate_columns:
+            text += "\n\n[{} rows x {} columns]".format(rows, len(self.columns))
+        return text
+
+    def _string_columns(self, shown_rows: List[int], shown_columns, half: Optional[int], dots_column: bool = False) -> List[List[str]]:
+        """
+        Each shown column as its header lines followed by its fixed width
+        values, the step numbers first. `half` is where the row of dots
+        goes when rows were left out; `dots_column` puts a column of dots
+        after the first one.
+        """
+        index = [str(row + 1) for row in shown_rows]
+        index_width = max(len(step) for step in index)
+        string_columns = [["", self.index_name] + [step.ljust(index_width) for step in index]]
+
+        for position, column in enumerate(shown_columns):
+            header = [_escape(self.title) if position == 0 else "", _escape(self.names[column])]
+            header_width = max(len(line) for line in header)
+            values = [" " + _escape(self.columns[column][row]) for row in shown_rows]
+            value_width = min(max(header_width, *(len(value) for value in values)), MAX_COLWIDTH)
+            values = [
+                (value[:value_width - 3] + "..." if len(value) > value_width else value).rjust(value_width)
+                for value in values
+            ]
+            column_width = max(value_width, header_width)
+            string_columns.append([line.rjust(column_width) for line in header] + values)
+
+        if dots_column:
+            string_columns.insert(2, [" ..."] * len(string_columns[0]))
+
+        if half is not None:
+            for position, column in enumerate(string_columns):
+                # pandas measures the row at `half` counting the header lines
+                width = len(column[half])
+                if dots_column and position == 2:
+                    dots = " ..."
+                elif position == 0:
+                    dots = ("..." if width > 3 else "..").ljust(width)
+                else:
+                    dots = ("..." if width > 3 else "..").rjust(width)
+                column.insert(half + 2, dots)
+
+        return string_columns
+
+def _escape(value: str) -> str:
+    return value.replace("\t", "\\t").replace("\r", "\\r").replace("\n", "\\n")
+
+def _adjoin(string_columns: List[List[str]]) -> List[str]:
+    """Lines of the columns side by side, each left-justified to its widest
+    entry and one space apart, as pandas' adjoin lays them out."""
+    widths = [max(len(value) for value in column) + 1 for column in string_columns[:-1]]
+    widths.append(max(len(value) for value in string_columns[-1]))
+    return [
+        "".join(value.ljust(width) for value, width in zip(line, widths))
+        for line in zip(*string_columns)
+    ]
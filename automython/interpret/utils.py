@@ -11,13 +11,12 @@ import os
 import pathlib
 import uuid
 import random
-# Optional imports for use with visual functionality
-try:
-    import pygraphviz as pgv
-except ImportError:
-    _visual_imports = False
-else:
-    _visual_imports = True
+
+import interpret.lazy as lazy
+
+# Optional import for use with visual functionality, only made once a
+# diagram is drawn
+pgv = lazy.LazyModule("pygraphviz")
 
 LayoutMethod = Literal["neato", "dot", "twopi", "circo", "fdp", "nop"]
 DTMSymbolT = str
@@ -46,7 +45,7 @@ def create_graph(
     reverse_orientation: bool = False,
     fig_size: Union[Tuple[float, float], Tuple[float], None] = None,
     state_separation: float = 0.5,
-) -> pgv.AGraph:
+) -> "pgv.AGraph":
     """Creates and returns a graph object
     Args:
         - horizontal (bool, optional): Direction of node layout. Defaults
@@ -59,7 +58,7 @@ def create_graph(
         AGraph with the given configuration.
     """
     
-    if not _visual_imports:
+    if not lazy.available(pgv):
         raise ImportError(
             "Missing visualization packages; "
             "please install coloraide and pygraphviz."
@@ -83,7 +82,7 @@ def create_graph(
     return graph
 
 def save_graph(
-    graph: pgv.AGraph,
+    graph: "pgv.AGraph",
     path: Union[str, os.PathLike],
 ) -> None:
     """Write `graph` to file given by `path`. PNG, SVG, etc.
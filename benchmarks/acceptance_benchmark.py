@@ -0,0 +1,75 @@
+"""Words per second for batch acceptance against a mid-size DFA, walking
+plain dicts word by word and running the compiled NumPy matrix in lockstep.
+
+Run from the repository root:
+
+    python benchmarks/acceptance_benchmark.py
+"""
+import pathlib
+import random
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "automython"))
+
+import interpret.fa_helpers as fa_helpers  # noqa: E402
+import interpret.helpers as helpers  # noqa: E402
+
+
+def make_dfa(states=200, symbols="01", seed=0):
+    rng = random.Random(seed)
+    names = ["q{}".format(i) for i in range(states)]
+    return helpers.make_DFA(
+        set(names),
+        set(symbols),
+        {name: {symbol: rng.choice(names) for symbol in symbols} for name in names},
+        names[0],
+        set(rng.sample(names, states // 3)),
+    )
+
+
+def make_words(count, length=16, symbols="01", seed=1):
+    """Words of `length` symbols, or of 0 to `length` symbols if negative."""
+    rng = random.Random(seed)
+    return [
+        "".join(
+            rng.choice(symbols)
+            for _ in range(length if length >= 0 else rng.randint(0, -length))
+        )
+        for _ in range(count)
+    ]
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main(count=100_000):
+    dfa = make_dfa()
+    compiled = fa_helpers.compile_dfa(dfa)
+
+    for length, label in ((16, "length 16"), (-32, "length 0-32")):
+        words = make_words(count, length)
+        walked, walk_time = timed(helpers._dfa_accepts_all, dfa, words)
+        vectorized, vector_time = timed(compiled.accepts_all, words)
+
+        assert walked == vectorized
+        assert compiled.final_states(words) == [
+            compiled.trace(word)[-1] for word in words
+        ]
+
+        print("{} words of {} on a {}-state DFA".format(
+            count, label, len(dfa.states)
+        ))
+        print("  dict walk: {:.3f} s, {:>12,.0f} words/s".format(
+            walk_time, count / walk_time
+        ))
+        print("  compiled:  {:.3f} s, {:>12,.0f} words/s".format(
+            vector_time, count / vector_time
+        ))
+
+
+if __name__ == "__main__":
+    main()
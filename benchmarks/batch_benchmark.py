@@ -0,0 +1,67 @@
+"""Time to run many small .theory scripts: starting the interpreter once per
+script against running them all with one `automython` command, which
+imports the interpreter once and forks a process per script from it.
+
+Run from the repository root:
+
+    python benchmarks/batch_benchmark.py
+"""
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import time
+
+AUTOMYTHON = pathlib.Path(__file__).resolve().parents[1] / "automython"
+
+SCRIPT = """dfa = DFA(
+    {{'q0', 'q1', 'q2'}},
+    {{'0', '1'}},
+    {{
+        'q0': {{'0': 'q0', '1': 'q1'}},
+        'q1': {{'0': 'q2', '1': 'q1'}},
+        'q2': {{'0': 'q2', '1': 'q{}'}}
+    }},
+    'q0',
+    {{'q1'}}
+)
+print(dfa)
+print(dfa.test("0101"))
+"""
+
+
+def automython(*arguments, cwd):
+    """Runs the interpreter on the command line, returning the milliseconds
+    it took."""
+    environment = dict(os.environ, PYTHONPATH=str(AUTOMYTHON))
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "interpret.interpreter", *arguments],
+        cwd=cwd, env=environment, check=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def main(count=20):
+    with tempfile.TemporaryDirectory() as directory:
+        scripts = []
+        for number in range(count):
+            script = "script{}.theory".format(chr(ord("a") + number))
+            with open(os.path.join(directory, script), "w") as file:
+                file.write(SCRIPT.format(number % 3))
+            scripts.append(script)
+        # Compiled once, so neither way pays for lexing and parsing
+        automython(*scripts, cwd=directory)
+
+        print("{} scripts printing and testing a 3-state DFA".format(count))
+        each = sum(automython(script, cwd=directory) for script in scripts)
+        print("  one process per script:  {:8.2f} ms".format(each))
+        for jobs in sorted({1, os.cpu_count() or 1}):
+            batch = automython(*scripts, "--jobs", str(jobs), cwd=directory)
+            print("  one command, {:>2} at once: {:8.2f} ms".format(jobs, batch))
+
+
+if __name__ == "__main__":
+    main()
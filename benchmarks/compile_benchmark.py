@@ -0,0 +1,69 @@
+"""Time to run a long .theory script, lexing and parsing it against running
+the compiled form an earlier run left in __pycache__.
+
+The script defines one DFA and then builds sets, dictionaries and tuples
+and prints results in a few thousand statements. Output goes to /dev/null.
+
+Run from the repository root:
+
+    python benchmarks/compile_benchmark.py
+"""
+import contextlib
+import os
+import pathlib
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "automython"))
+
+import interpret.compiler as compiler  # noqa: E402
+import interpret.file_interface as file_interface  # noqa: E402
+
+
+def name(prefix, number):
+    """A variable name for `number`; names may only hold letters."""
+    letters = ""
+    while True:
+        number, digit = divmod(number, 26)
+        letters += chr(ord("a") + digit)
+        if not number:
+            return prefix + letters
+
+
+def make_script(statements=3000):
+    lines = [
+        "dfa = DFA({'s0', 's1'}, {'0', '1'}, "
+        "{'s0': {'0': 's1', '1': 's0'}, 's1': {'0': 's1', '1': 's0'}}, 's0', {'s1'})"
+    ]
+    for i in range(statements // 3):
+        words = name("words_", i)
+        lines.append("{} = {{'{:b}', '{:b}', '{:b}', '0', '1'}}".format(words, i, i + 1, i + 2))
+        lines.append("{0} = {{'w': ('{1}', {1}, True), 'n': {{'k': 'v{1}'}}}}".format(name("table_", i), i))
+        lines.append("print(dfa.accepts_all({}))".format(words))
+    return "\n".join(lines) + "\n"
+
+
+def timed(script):
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        file_interface.interpret(script)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, "long.theory")
+        with open(script, "w") as file:
+            file.write(make_script())
+
+        print("3000 statements")
+        compiler.ENABLED = False
+        print("  no cache:      {:8.2f} ms".format(timed(script)))
+        compiler.ENABLED = True
+        print("  first run:     {:8.2f} ms".format(timed(script)))
+        print("  compiled run:  {:8.2f} ms".format(timed(script)))
+
+
+if __name__ == "__main__":
+    main()
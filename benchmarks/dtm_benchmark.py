@@ -0,0 +1,86 @@
+"""Steps per second and peak memory for a DTM deciding 0^n1^n, which takes
+about n^2 steps, comparing a full configuration per step, the per-step
+delta recorder test() and save() use, and the compiled runner on its own.
+
+Run from the repository root:
+
+    python benchmarks/dtm_benchmark.py
+"""
+import pathlib
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "automython"))
+
+import interpret.helpers as helpers  # noqa: E402
+
+
+def make_dtm():
+    """Crosses off a 0 and a 1 per pass until none are left."""
+    return helpers.make_DTM(
+        {"q0", "q1", "q2", "q3", "q4"},
+        {"0", "1"},
+        {"0", "1", "x", "y", "."},
+        {
+            "q0": {"0": ("q1", "x", "R"), "y": ("q3", "y", "R")},
+            "q1": {"0": ("q1", "0", "R"), "1": ("q2", "y", "L"), "y": ("q1", "y", "R")},
+            "q2": {"0": ("q2", "0", "L"), "x": ("q0", "x", "R"), "y": ("q2", "y", "L")},
+            "q3": {"y": ("q3", "y", "R"), ".": ("q4", ".", "R")},
+        },
+        "q0",
+        ".",
+        {"q4"},
+    )
+
+
+def timed(function, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def report(label, steps, elapsed, peak):
+    print("  {:<15} {:.3f} s, {:>12,.0f} steps/s, peak {:>12,} bytes".format(
+        label, elapsed, steps / elapsed, peak
+    ))
+
+
+def main():
+    dtm = make_dtm()
+    # Lift the step and tape budgets; these runs are known to halt
+    helpers.limit(dtm, 0, 0)
+
+    for n in (50, 100, 200):
+        word = "0" * n + "1" * n
+        configurations, configurations_time, configurations_peak = timed(
+            lambda: list(dtm.read_input_stepwise(word, ignore_rejection=True))
+        )
+        history, history_time, history_peak = timed(dtm.record, word)
+        result, compiled_time, compiled_peak = timed(dtm.run, word)
+        assert len(configurations) - 2 == len(history) == result.steps
+
+        print("0^{0} 1^{0}: {1:,} steps".format(n, result.steps))
+        report("configurations:", result.steps, configurations_time, configurations_peak)
+        report("deltas:", result.steps, history_time, history_peak)
+        report("compiled:", result.steps, compiled_time, compiled_peak)
+
+    word = "0" * 230 + "1" * 230
+    table, elapsed, peak = timed(helpers.test, dtm, word)
+    print("test() on 0^230 1^230: {:,} rows in {:.3f} s, peak {:,} bytes".format(
+        len(table[0]), elapsed, peak
+    ))
+
+    word = "0" * 1000 + "1" * 1000
+    result, compiled_time, compiled_peak = timed(dtm.run, word)
+    print("0^1000 1^1000 compiled only: {:,} steps in {:.3f} s, peak {:,} bytes".format(
+        result.steps, compiled_time, compiled_peak
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Milliseconds per machine to export many random DFAs with save(), as
+PNG, as SVG, as SVG after the same diagram was saved as PNG (reusing its
+layout), and as DOT source, which needs no layout at all.
+
+The on-disk cache lives in a temporary directory and starts out empty.
+
+Run from the repository root:
+
+    python benchmarks/export_benchmark.py
+"""
+import os
+import pathlib
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "automython"))
+
+import interpret.helpers as helpers  # noqa: E402
+
+
+def make_dfas(count, states=20, seed=0):
+    rng = random.Random(seed)
+    names = ["q{}".format(i) for i in range(states)]
+    return [
+        helpers.make_DFA(
+            set(names),
+            {"0", "1"},
+            {name: {"0": rng.choice(names), "1": rng.choice(names)} for name in names},
+            names[0],
+            set(rng.sample(names, 3)),
+        )
+        for _ in range(count)
+    ]
+
+
+def export(dfas, directory, *suffixes):
+    """Saves each DFA in every format in turn; returns the ms the last file
+    took."""
+    elapsed = 0.0
+    for index, dfa in enumerate(dfas):
+        for suffix in suffixes:
+            start = time.perf_counter()
+            helpers.save(dfa, os.path.join(directory, "m{}{}".format(index, suffix)), "0110")
+            elapsed = time.perf_counter() - start
+    return elapsed * 1000
+
+
+def timed(function, dfas, *args):
+    start = time.perf_counter()
+    function(dfas, *args)
+    return (time.perf_counter() - start) / len(dfas) * 1000
+
+
+def main(count=100):
+    dfas = make_dfas(count)
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["AUTOMYTHON_CACHE_DIR"] = os.path.join(directory, "cache")
+        os.mkdir(os.path.join(directory, "pair"))
+        print("{} DFAs with 20 states".format(count))
+        half = count // 2
+        print("  .png:               {:7.2f} ms each".format(timed(export, dfas[:half], directory, ".png")))
+        print("  .svg:               {:7.2f} ms each".format(timed(export, dfas[half:], directory, ".svg")))
+        print("  .svg after its .png {:7.2f} ms each".format(
+            sum(export([dfa], os.path.join(directory, "pair"), ".png", ".svg") for dfa in make_dfas(half, seed=1)) / half
+        ))
+        print("  .dot:               {:7.2f} ms each".format(timed(export, dfas, directory, ".dot")))
+
+
+if __name__ == "__main__":
+    main()
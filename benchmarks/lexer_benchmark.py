@@ -0,0 +1,61 @@
+"""Lexing time for single-line DFA literals of growing size.
+
+Run from the repository root:
+
+    python benchmarks/lexer_benchmark.py
+"""
+import pathlib
+import sys
+import timeit
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "automython"))
+
+import interpret.Lexer as fa_lex  # noqa: E402
+
+
+def make_dfa_source(transitions):
+    """A whitespace-stripped DFA definition with `transitions` transitions
+    over the alphabet {0, 1}, all on one line as file_interface feeds it."""
+    states = transitions // 2
+    names = ['"q{}"'.format(i) for i in range(states)]
+    rows = ",".join(
+        '"q{0}":{{"0":"q{1}","1":"q{2}"}}'.format(
+            i, (2 * i) % states, (2 * i + 1) % states
+        )
+        for i in range(states)
+    )
+    return 'dfa=DFA({{{}}},{{"0","1"}},{{{}}},"q0",{{"q0"}})\n'.format(
+        ",".join(names), rows
+    )
+
+
+def lex_incremental(text):
+    lexer = fa_lex.Lexer(text)
+    while lexer.get_token().type != fa_lex.EOF:
+        pass
+
+
+def lex_single_pass(text):
+    fa_lex.Lexer(text).get_tokens()
+
+
+def main():
+    print("{:>12} {:>10} {:>16} {:>16}".format(
+        "transitions", "tokens", "get_token (s)", "get_tokens (s)"
+    ))
+    for transitions in (1_000, 10_000, 20_000, 40_000):
+        text = make_dfa_source(transitions)
+        count = len(fa_lex.Lexer(text).get_tokens())
+        incremental = min(timeit.repeat(
+            lambda: lex_incremental(text), number=1, repeat=3
+        ))
+        single_pass = min(timeit.repeat(
+            lambda: lex_single_pass(text), number=1, repeat=3
+        ))
+        print("{:>12} {:>10} {:>16.4f} {:>16.4f}".format(
+            transitions, count, incremental, single_pass
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Time to run a .theory script that defines a large DFA, NFA and DTM,
+parsing and validating every machine against taking the definitions from
+the program an earlier run compiled, both while the script is unchanged
+and once another of its statements has been edited.
+
+Run from the repository root:
+
+    python benchmarks/machine_definition_benchmark.py
+"""
+import os
+import pathlib
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "automython"))
+
+import interpret.compiler as compiler  # noqa: E402
+import interpret.file_interface as file_interface  # noqa: E402
+
+
+def literal(value):
+    """`value` written the way a .theory file spells it."""
+    if isinstance(value, (set, list)):
+        return "{" + ", ".join(literal(element) for element in sorted(value)) + "}"
+    if isinstance(value, tuple):
+        return "(" + ", ".join(literal(element) for element in value) + ")"
+    if isinstance(value, dict):
+        return "{" + ", ".join(
+            "{}: {}".format(literal(key), literal(value[key])) for key in sorted(value)
+        ) + "}"
+    return "'{}'".format(value)
+
+
+def make_script(states=300, seed=0):
+    rng = random.Random(seed)
+    names = ["q{}".format(i) for i in range(states)]
+    dfa = {name: {symbol: rng.choice(names) for symbol in "01"} for name in names}
+    nfa = {name: {symbol: set(rng.sample(names, 2)) for symbol in "01"} for name in names}
+    dtm = {
+        name: {symbol: (rng.choice(names), rng.choice("01x"), rng.choice("LR")) for symbol in "01"}
+        for name in names[:-1]
+    }
+    finals = set(rng.sample(names[:-1], 5))
+    return "\n".join([
+        "dfa = DFA({}, {{'0', '1'}}, {}, 'q0', {})".format(literal(set(names)), literal(dfa), literal(finals)),
+        "nfa = NFA({}, {{'0', '1'}}, {}, 'q0', {})".format(literal(set(names)), literal(nfa), literal(finals)),
+        "dtm = DTM({}, {{'0', '1'}}, {{'0', '1', 'x', '.'}}, {}, 'q0', '.', {})".format(
+            literal(set(names)), literal(dtm), literal({names[-1]})
+        ),
+    ]) + "\n"
+
+
+def timed(script):
+    start = time.perf_counter()
+    file_interface.interpret(script)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, "machines.theory")
+        with open(script, "w") as file:
+            file.write(make_script())
+
+        print("A DFA, NFA and DTM of 300 states each")
+        compiler.ENABLED = False
+        print("  no cache:        {:8.2f} ms".format(timed(script)))
+        compiler.ENABLED = True
+        print("  first run:       {:8.2f} ms".format(timed(script)))
+        print("  unchanged run:   {:8.2f} ms".format(timed(script)))
+        with open(script, "a") as file:
+            file.write("edited = True\n")
+        print("  edited run:      {:8.2f} ms".format(timed(script)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Words per second for NFA acceptance on machines with hundreds of states,
+comparing automata-lib's set-based accepts_input with the bitmask engine,
+with and without its lazy subset-construction cache.
+
+Run from the repository root:
+
+    python benchmarks/nfa_benchmark.py
+"""
+import pathlib
+import random
+import sys
+import time
+
+from automata.fa.nfa import NFA
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "automython"))
+
+import interpret.fa_helpers as fa_helpers  # noqa: E402
+
+
+def make_nfa_parameters(states, symbols="01", seed=0):
+    """A random NFA with a few targets per symbol and sparse lambda edges."""
+    rng = random.Random(seed)
+    names = ["q{}".format(i) for i in range(states)]
+    transitions = {}
+    for name in names:
+        lookup = {symbol: set(rng.sample(names, 3)) for symbol in symbols}
+        if rng.random() < 0.2:
+            lookup[""] = {rng.choice(names)}
+        transitions[name] = lookup
+    return dict(
+        states=set(names),
+        input_symbols=set(symbols),
+        transitions=transitions,
+        initial_state=names[0],
+        final_states=set(rng.sample(names, states // 10)),
+    )
+
+
+def make_words(count, length=16, symbols="01", seed=1):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(symbols) for _ in range(length)) for _ in range(count)]
+
+
+def make_similar_words(count, length=16, bases=20, symbols="01", seed=2):
+    """Words that each differ from one of a few base words in one symbol."""
+    rng = random.Random(seed)
+    base_words = make_words(bases, length, symbols, seed)
+    words = []
+    for _ in range(count):
+        word = list(rng.choice(base_words))
+        word[rng.randrange(length)] = rng.choice(symbols)
+        words.append("".join(word))
+    return words
+
+
+def timed(function, words):
+    start = time.perf_counter()
+    result = [function(word) for word in words]
+    return result, time.perf_counter() - start
+
+
+def main(count=500):
+    for states in (100, 300, 1000):
+        parameters = make_nfa_parameters(states)
+        library = NFA(**parameters)
+
+        for words, label in (
+            (make_words(count), "random"),
+            (make_similar_words(count * 4), "similar"),
+        ):
+            uncached = fa_helpers.CompiledNFA(library, cache_size=0)
+            cached = fa_helpers.CompiledNFA(library)
+
+            expected, library_time = timed(library.accepts_input, words)
+            result, uncached_time = timed(uncached.accepts, words)
+            assert expected == result
+            result, cached_time = timed(cached.accepts, words)
+            assert expected == result
+
+            print("{} {} words of length 16 on a {}-state NFA".format(
+                len(words), label, states
+            ))
+            print("  accepts_input: {:.3f} s, {:>10,.0f} words/s".format(
+                library_time, len(words) / library_time
+            ))
+            for name, elapsed in (("bitmask:", uncached_time), ("cached:", cached_time)):
+                print("  {:<14} {:.3f} s, {:>10,.0f} words/s ({:.1f}x)".format(
+                    name, elapsed, len(words) / elapsed, library_time / elapsed
+                ))
+            print("  {} state sets cached".format(len(cached.subsets)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Time for save() to write the highlighted run of 500 test words on one
+DTM deciding 0^n1^n, laying out every diagram against drawing each run
+over one layout of the machine (--overlay-paths).
+
+The render cache is off, so no diagram is copied from disk. Laying out
+every diagram is timed on the first 50 words only.
+
+Run from the repository root:
+
+    python benchmarks/overlay_benchmark.py
+"""
+import os
+import pathlib
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "automython"))
+
+import interpret.helpers as helpers  # noqa: E402
+import interpret.render_cache as render_cache  # noqa: E402
+import interpret.render_overlay as render_overlay  # noqa: E402
+import interpret.render_queue as render_queue  # noqa: E402
+from dtm_benchmark import make_dtm  # noqa: E402
+
+
+def make_words(count, seed=0):
+    rng = random.Random(seed)
+    words = []
+    for _ in range(count):
+        n = rng.randint(1, 12)
+        word = "0" * n + "1" * n
+        if rng.random() < 0.5:
+            position = rng.randrange(len(word))
+            word = word[:position] + rng.choice("01") + word[position + 1:]
+        words.append(word)
+    return words
+
+
+def save_all(dtm, directory, words):
+    start = time.perf_counter()
+    for index, word in enumerate(words):
+        helpers.save(dtm, os.path.join(directory, "run{}.png".format(index)), word)
+    return (time.perf_counter() - start) / len(words) * 1000
+
+
+def main(count=500):
+    render_cache.ENABLED = False
+    render_queue.WORKERS = 1
+    dtm = make_dtm()
+    helpers.limit(dtm, 0, 0)
+    words = make_words(count)
+
+    with tempfile.TemporaryDirectory() as directory:
+        print("{} words on one DTM".format(count))
+        render_overlay.ENABLED = False
+        print("  layout per diagram:  {:7.2f} ms each".format(save_all(dtm, directory, words[:50])))
+
+        render_overlay.ENABLED = True
+        start = time.perf_counter()
+        render_cache.layout(dtm)
+        layout = (time.perf_counter() - start) * 1000
+        print("  overlay:             {:7.2f} ms each, after {:.2f} ms laying out the machine".format(
+            save_all(dtm, directory, words), layout
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Parse time for DFA definitions and set/dict literals of growing size,
+and statement throughput over large generated scripts.
+
+Run from the repository root:
+
+    python benchmarks/parser_benchmark.py
+"""
+import pathlib
+import sys
+import timeit
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "automython"))
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+
+import interpret.Parser as fa_parse  # noqa: E402
+from lexer_benchmark import make_dfa_source  # noqa: E402
+
+
+def parse(text, pretokenize):
+    parser = fa_parse.Parser()
+    parser.lexer = fa_parse.fa_lex.Lexer(pretokenize=pretokenize)
+    parser.lexer.load(text)
+    return parser.parse_line()
+
+
+def make_script(statements):
+    """A script cycling through every kind of statement parse_line accepts."""
+    lines = [
+        'x{0}={1}+1',
+        'print(x{0})',
+        's{0}={{"a{1}","b{1}"}}',
+        'print((1,2))',
+        'd.test("0101")',
+        'print(d.test("01"))',
+        'open("d{1}.png")',
+    ]
+    return "".join(
+        lines[i % len(lines)].format(_name(i), i) + "\n"
+        for i in range(statements)
+    )
+
+
+def _name(i):
+    # Variables are letters only
+    return "".join(chr(ord("a") + int(digit)) for digit in str(i))
+
+
+def make_literals(elements):
+    """A set literal and a dict literal with `elements` elements each."""
+    return (
+        "s={" + ",".join('"q{}"'.format(i) for i in range(elements)) + "}",
+        "d={" + ",".join(
+            '("q{0}","a"):"q{0}"'.format(i) for i in range(elements)
+        ) + "}",
+    )
+
+
+def parse_script(text):
+    parser = fa_parse.Parser()
+    parser.lexer.load(text)
+    t = parser.lexer.peek_token()
+    while t.type != fa_parse.fa_lex.EOF:
+        parser.parse_line()
+        t = parser.lexer.peek_token()
+        while t.type == fa_parse.fa_lex.EOL:
+            parser.lexer.get_token()
+            t = parser.lexer.peek_token()
+
+
+def main():
+    print("{:>12} {:>20} {:>20}".format(
+        "transitions", "re-lexing (s)", "token array (s)"
+    ))
+    for transitions in (1_000, 5_000, 10_000):
+        text = make_dfa_source(transitions)
+        timings = [
+            min(timeit.repeat(
+                lambda: parse(text, pretokenize), number=1, repeat=3
+            ))
+            for pretokenize in (False, True)
+        ]
+        print("{:>12} {:>20.4f} {:>20.4f}".format(transitions, *timings))
+
+    print()
+    print("{:>12} {:>20} {:>20}".format(
+        "elements", "set literal (s)", "dict literal (s)"
+    ))
+    for elements in (1_000, 10_000, 100_000):
+        timings = [
+            min(timeit.repeat(
+                lambda: parse(literal + "\n", True), number=1, repeat=3
+            ))
+            for literal in make_literals(elements)
+        ]
+        print("{:>12} {:>20.4f} {:>20.4f}".format(elements, *timings))
+
+    print()
+    print("{:>12} {:>20} {:>20}".format(
+        "statements", "time (s)", "statements/s"
+    ))
+    for statements in (1_000, 10_000, 50_000):
+        text = make_script(statements)
+        elapsed = min(timeit.repeat(
+            lambda: parse_script(text), number=1, repeat=3
+        ))
+        print("{:>12} {:>20.4f} {:>20.0f}".format(
+            statements, elapsed, statements / elapsed
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Time for save() to write a diagram with and without the render cache,
+for a DTM deciding 0^n1^n drawn with its run on a few inputs highlighted.
+
+The cache lives in a temporary directory, so the first cached save() is
+a miss that renders and stores the diagram and the second is a hit.
+
+Run from the repository root:
+
+    python benchmarks/render_benchmark.py
+"""
+import os
+import pathlib
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "automython"))
+
+import interpret.helpers as helpers  # noqa: E402
+import interpret.render_cache as render_cache  # noqa: E402
+from dtm_benchmark import make_dtm  # noqa: E402
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    dtm = make_dtm()
+    helpers.limit(dtm, 0, 0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["AUTOMYTHON_CACHE_DIR"] = os.path.join(directory, "cache")
+        path = os.path.join(directory, "dtm.png")
+
+        for n in (2, 8, 16):
+            word = "0" * n + "1" * n
+            render_cache.ENABLED = False
+            uncached = timed(helpers.save, dtm, path, word)
+            render_cache.ENABLED = True
+            miss = timed(helpers.save, dtm, path, word)
+            hit = timed(helpers.save, dtm, path, word)
+
+            print("0^{0} 1^{0}: {1} highlighted steps".format(n, len(dtm.record(word))))
+            print("  uncached: {:8.3f} s".format(uncached))
+            print("  miss:     {:8.3f} s".format(miss))
+            print("  hit:      {:8.3f} s ({:.0f}x)".format(hit, uncached / hit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Wall time for a script-like sequence of save() calls, drawing each
+diagram before save() returns against queueing them on the render pool.
+
+The render cache is off, so every diagram is laid out. Speedup depends
+on the number of cores; with one core there is nothing to gain.
+
+Run from the repository root:
+
+    python benchmarks/render_queue_benchmark.py
+"""
+import os
+import pathlib
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "automython"))
+
+import interpret.helpers as helpers  # noqa: E402
+import interpret.render_cache as render_cache  # noqa: E402
+import interpret.render_queue as render_queue  # noqa: E402
+from dtm_benchmark import make_dtm  # noqa: E402
+
+
+def save_all(dtm, directory, words):
+    for index, word in enumerate(words):
+        helpers.save(dtm, os.path.join(directory, "dtm{}.png".format(index)), word)
+    render_queue.wait()
+
+
+def main(diagrams=8):
+    render_cache.ENABLED = False
+    dtm = make_dtm()
+    helpers.limit(dtm, 0, 0)
+    words = ["0" * n + "1" * n for n in range(4, 4 + diagrams)]
+    cores = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        print("{} DTM diagrams, {} cores".format(diagrams, cores))
+        for workers in sorted({1, 2, max(cores, 2)}):
+            render_queue.WORKERS = workers
+            start = time.perf_counter()
+            save_all(dtm, directory, words)
+            print("  {} render processes: {:.3f} s".format(workers, time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
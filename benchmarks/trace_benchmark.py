@@ -0,0 +1,61 @@
+"""Time to build and print test() walkthrough tables, comparing the
+DataFrame the builders used to assemble on every call with a Trace, which
+keeps plain columns and renders the same text itself.
+
+Run from the repository root:
+
+    python benchmarks/trace_benchmark.py
+"""
+import pathlib
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "automython"))
+
+import interpret.trace_helpers as trace_helpers  # noqa: E402
+
+
+def make_columns(rows, states=12, seed=0):
+    rng = random.Random(seed)
+    names = ["q{}".format(i) for i in range(states)]
+    return {
+        "Current state:": [rng.choice(names) for _ in range(rows)],
+        "Input symbol:": [rng.choice("01") for _ in range(rows)],
+        "New state:": [rng.choice(names) for _ in range(rows)],
+    }
+
+
+def data_frame(title, columns):
+    """The assembly the walkthrough builders did before Trace."""
+    frame = pd.DataFrame.from_dict(columns)
+    frame.index += 1
+    frame = pd.DataFrame.from_dict(frame).rename_axis("Step:", axis=1)
+    frame.columns = pd.MultiIndex.from_product([[title], frame.columns])
+    return frame
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        text = function()
+    return text, (time.perf_counter() - start) / repeat
+
+
+def main():
+    title = '[DFA on "0110" is Accepted!]'
+    for rows, repeat in ((4, 200), (16, 200), (60, 100), (1_000, 50), (100_000, 5)):
+        columns = make_columns(rows)
+        expected, frame_time = timed(lambda: str(data_frame(title, columns)), repeat)
+        result, trace_time = timed(lambda: str(trace_helpers.Trace(title, columns)), repeat)
+        assert expected == result
+
+        print("{:>7,} rows: DataFrame {:8.3f} ms, Trace {:8.3f} ms ({:.1f}x)".format(
+            rows, frame_time * 1000, trace_time * 1000, frame_time / trace_time
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Tree memory and visit time for a 50k-transition DFA transition literal,
+and per-statement visit cost as a script grows to 10k statements.
+
+Run from the repository root:
+
+    python benchmarks/visitor_benchmark.py
+"""
+import pathlib
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "automython"))
+
+import interpret.Parser as fa_parse  # noqa: E402
+import interpret.Visitor as fa_visitor  # noqa: E402
+
+
+def make_transitions_source(transitions):
+    states = transitions // 2
+    return "t={" + ",".join(
+        '"q{0}":{{"0":"q{1}","1":"q{2}"}}'.format(
+            i, (2 * i) % states, (2 * i + 1) % states
+        )
+        for i in range(states)
+    ) + "}\n"
+
+
+def make_script(statements):
+    """Assignments interleaved with a small DFA every 100 statements."""
+    dfa = (
+        'DFA({{"a","b"}},{{"0"}},{{"a":{{"0":"b"}},"b":{{"0":"a"}}}},'
+        '"a",{{"a"}})'
+    )
+    lines = []
+    for i in range(statements):
+        name = "".join(chr(ord("a") + int(digit)) for digit in str(i))
+        value = dfa if i % 100 == 0 else "{}+1".format(i)
+        lines.append("v{}={}".format(name, value.format()))
+    return "\n".join(lines) + "\n"
+
+
+def run_script(text):
+    parser = fa_parse.Parser()
+    parser.lexer.load(text)
+    nodes = []
+    t = parser.lexer.peek_token()
+    while t.type != fa_parse.fa_lex.EOF:
+        nodes.append(parser.parse_line())
+        t = parser.lexer.peek_token()
+        while t.type == fa_parse.fa_lex.EOL:
+            parser.lexer.get_token()
+            t = parser.lexer.peek_token()
+
+    visitor = fa_visitor.Visitor()
+    start = time.perf_counter()
+    for node in nodes:
+        visitor.visit(node)
+    return time.perf_counter() - start
+
+
+def main(transitions=50_000):
+    parser = fa_parse.Parser()
+    parser.lexer.load(make_transitions_source(transitions))
+
+    tracemalloc.start()
+    node = parser.parse_line()
+    tree_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    visitor = fa_visitor.Visitor()
+    start = time.perf_counter()
+    visitor.visit(node)
+    elapsed = time.perf_counter() - start
+
+    print("transitions:         {}".format(transitions))
+    print("parse tree:          {:.1f} MB ({:.0f} bytes/transition)".format(
+        tree_bytes / 1e6, tree_bytes / transitions
+    ))
+    print("visit:               {:.4f} s ({:.2f} us/transition)".format(
+        elapsed, elapsed / transitions * 1e6
+    ))
+
+    print()
+    print("{:>12} {:>12} {:>16}".format("statements", "visit (s)", "us/statement"))
+    for statements in (1_000, 10_000):
+        elapsed = run_script(make_script(statements))
+        print("{:>12} {:>12.4f} {:>16.2f}".format(
+            statements, elapsed, elapsed / statements * 1e6
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -29,7 +29,7 @@ setup(
         "automata-lib[visual]",
         "pandas",
         "ipython",
-        "forbiddenfruit"
+        "numpy"
     ],
     entry_points={
         'console_scripts': [
@@ -0,0 +1,136 @@
+import contextlib
+import io
+import os
+import pathlib
+import shutil
+import sys
+
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "automython"))
+
+import interpret.compiler as compiler  # noqa: E402
+import interpret.file_interface as file_interface  # noqa: E402
+
+# Every kind of statement, as in test.theory, but without saving diagrams
+MIXED_SCRIPT = """\
+integer = 123
+print(integer)
+print(integer + 4 + 5)
+string = "s0"
+print(string + "s1")
+boolean = True
+print(boolean)
+inner = {"s2": 1}
+dict = {"s1": inner, "s3": {"s4": 2}}
+merged = {dict, "s5": 3}
+print(merged)
+set = {"s1", "s2", "s3"}
+print(set)
+tuple = ("s1", integer, True)
+print(tuple)
+print(("s1", "s2", "s3"))
+dfa = DFA(
+    {"s0", "s1", "s2"},
+    {"0", "1"},
+    {"s0": {"0": "s0", "1": "s1"},
+    "s1": {"0": "s0", "1": "s2"},
+    "s2": {"0": "s0", "1": "s2"}},
+    "s0",
+    {"s2"}
+)
+print(dfa)
+nfa = NFA(
+    {"s" + "0", "s1", "s2"},
+    {"0", "1", ""},
+    {"s0": {"0": {"s0"}, "1": {"s0", "s1"}},
+    "s1": {"1": {"s2"}, "": {"s2"}},
+    "s2": {"0": {"s2"}}},
+    "s0",
+    {"s2"}
+)
+print(nfa)
+dtm = DTM(
+    {'q0', 'q1', 'q2'},
+    {'0', '1'},
+    {'0', '1', '#'},
+    {'q0': {'0': ('q0', '1', 'R'), '1': ('q1', '0', 'R')},
+    'q1': {'#': ('q2', '#', 'L')}},
+    'q0',
+    '#',
+    {'q2'}
+)
+print(dtm)
+words = {"011", "0011", "1"}
+print(dfa.accepts_all(words))
+print(nfa.accepts_all({"11", "10", "0"}))
+print(dtm.accepts_all({"001", "0"}))
+print(dfa.test("1011"))
+print(nfa.test("11"))
+print(dtm.test("001"))
+definition = dfa.definition()
+print(definition)
+print(dtm.definition())
+"""
+
+# Machines MIXED_SCRIPT defines from literals alone
+MIXED_MACHINES = 3
+
+
+@pytest.fixture
+def script(tmp_path):
+    path = tmp_path / "mixed.theory"
+    path.write_text(MIXED_SCRIPT)
+    return path
+
+
+@pytest.fixture
+def compile_cache(monkeypatch):
+    """Sets whether the compile cache is enabled, for the test only."""
+    def enable(enabled=True):
+        monkeypatch.setattr(compiler, "ENABLED", enabled)
+    enable()
+    return enable
+
+
+@pytest.fixture
+def compiled(monkeypatch):
+    """Whether the last run read its program from the compile cache."""
+    runs = []
+    load = compiler.load
+
+    def recorded_load(script, source):
+        program = load(script, source)
+        runs.append(program is not None)
+        return program
+
+    monkeypatch.setattr(compiler, "load", recorded_load)
+    return lambda: runs[-1]
+
+
+@pytest.fixture
+def changeable(monkeypatch, tmp_path):
+    """A copy of a module's source that the caches stamp in its place, so
+    it can be changed without touching the checked-out tree."""
+    def copy(module):
+        path = tmp_path / "modules" / pathlib.Path(module.__file__).name
+        path.parent.mkdir(exist_ok=True)
+        shutil.copy2(module.__file__, path)
+        monkeypatch.setattr(module, "__file__", str(path))
+        return path
+    return copy
+
+
+def change(path):
+    """Gives `path` a later modification time, as editing it would."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def interpreted(script):
+    """What file_interface.interpret() prints for `script`."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        file_interface.interpret(str(script))
+    return output.getvalue()
+
@@ -0,0 +1,82 @@
+import contextlib
+import io
+
+import pytest
+
+import interpret.Lexer as fa_lex
+import interpret.Parser as fa_parse
+import interpret.Visitor as fa_visitor
+import interpret.compiler as compiler
+import interpret.file_interface as file_interface
+from conftest import change, interpreted
+
+
+def tree_walked(script):
+    """What `script` prints when its parsed statements are visited, the
+    way scripts ran before they were compiled."""
+    parser = fa_parse.Parser()
+    visitor = fa_visitor.Visitor()
+    output = io.StringIO()
+    with open(script) as source, contextlib.redirect_stdout(output):
+        for text, first_line in file_interface.statements(source):
+            parser.lexer.load(text, first_line)
+            while True:
+                token = parser.lexer.peek_token()
+                if token.type == fa_lex.EOF:
+                    break
+                if token.type == fa_lex.EOL:
+                    parser.lexer.get_token()
+                    continue
+                node = parser.parse_line()
+                if node:
+                    visitor.visit(node)
+            file_interface.flush(visitor)
+    return output.getvalue()
+
+
+def test_compiled_runs_print_what_tree_walked_runs_do(script, compile_cache, compiled):
+    expected = tree_walked(script)
+    compile_cache(False)
+    assert interpreted(script) == expected
+    compile_cache(True)
+    assert interpreted(script) == expected
+    assert not compiled()
+    assert interpreted(script) == expected
+    assert compiled()
+
+
+def test_edited_script_misses(script, compile_cache, compiled):
+    expected = interpreted(script)
+    assert interpreted(script) == expected
+    assert compiled()
+    with open(script, "a") as file:
+        file.write('print("edited")\n')
+    assert interpreted(script) == expected + "edited\n"
+    assert not compiled()
+    assert interpreted(script) == expected + "edited\n"
+    assert compiled()
+
+
+@pytest.mark.parametrize("module", [compiler, fa_parse, fa_lex], ids=["compiler", "parser", "lexer"])
+def test_changed_compiler_misses(script, compile_cache, compiled, changeable, module):
+    source = changeable(module)
+    expected = interpreted(script)
+    change(source)
+    assert interpreted(script) == expected
+    assert not compiled()
+    assert interpreted(script) == expected
+    assert compiled()
+
+
+def test_program_cut_short_is_not_run(script, compile_cache):
+    interpreted(script)
+    path = compiler.cache_path(str(script))
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError, match="incomplete"):
+        interpreted(script)
+
+
+def test_disabled_cache_writes_nothing(script, compile_cache):
+    compile_cache(False)
+    interpreted(script)
+    assert not compiler.cache_path(str(script)).exists()
@@ -0,0 +1,102 @@
+import automata
+import automata.base.config as automata_config
+import pytest
+
+import interpret.Parser as fa_parse
+import interpret.helpers as helpers
+from conftest import MIXED_MACHINES, change, interpreted
+
+INVALID_SCRIPT = """\
+dfa = DFA({"s0"}, {"0"}, {"s0": {"0": "s0"}}, "s0", {"s9"})
+print("built")
+"""
+
+
+@pytest.fixture
+def validated(monkeypatch):
+    """Whether each machine built since the last call was validated."""
+    builds = []
+    for name in ("make_DFA", "make_NFA", "make_DTM"):
+        def recorded_make(*args, make=getattr(helpers, name), **kwargs):
+            builds.append(automata_config.should_validate_automata)
+            return make(*args, **kwargs)
+        monkeypatch.setattr(helpers, name, recorded_make)
+
+    def taken():
+        machines = list(builds)
+        builds.clear()
+        return machines
+    return taken
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """How many statements were parsed since the last call."""
+    statements = []
+    parse_line = fa_parse.Parser.parse_line
+
+    def counted_parse_line(parser):
+        statements.append(None)
+        return parse_line(parser)
+
+    monkeypatch.setattr(fa_parse.Parser, "parse_line", counted_parse_line)
+
+    def count():
+        parsed_statements = len(statements)
+        statements.clear()
+        return parsed_statements
+    return count
+
+
+def test_definitions_are_validated_once(script, compile_cache, validated):
+    expected = interpreted(script)
+    assert validated() == [True] * MIXED_MACHINES
+    assert interpreted(script) == expected
+    assert validated() == [False] * MIXED_MACHINES
+    assert automata_config.should_validate_automata
+
+
+def test_edited_script_reuses_unchanged_definitions(script, compile_cache, validated, parsed):
+    expected = interpreted(script)
+    statements = parsed()
+    validated()
+    with open(script, "a") as file:
+        file.write('print("edited")\n')
+    assert interpreted(script) == expected + "edited\n"
+    assert parsed() == statements + 1 - MIXED_MACHINES
+    assert validated() == [False] * MIXED_MACHINES
+
+
+def test_edited_definition_is_validated_again(script, compile_cache, validated):
+    expected = interpreted(script)
+    validated()
+    script.write_text(script.read_text().replace('{"s2"}\n)\nprint(dfa)', '{"s1"}\n)\nprint(dfa)'))
+    assert interpreted(script) != expected
+    assert validated() == [True, False, False]
+
+
+def test_invalid_definition_is_validated_every_run(tmp_path, compile_cache, validated):
+    script = tmp_path / "invalid.theory"
+    script.write_text(INVALID_SCRIPT)
+    expected = interpreted(script)
+    assert "s9" in expected
+    assert validated() == [True]
+    for _ in range(2):
+        assert interpreted(script) == expected
+        assert validated() == [True]
+
+
+def test_changed_automata_lib_validates_again(script, compile_cache, validated, changeable):
+    automata_source = changeable(automata)
+    expected = interpreted(script)
+    change(automata_source)
+    validated()
+    assert interpreted(script) == expected
+    assert validated() == [True] * MIXED_MACHINES
+
+
+def test_disabled_compile_cache_validates_every_machine(script, compile_cache, validated):
+    compile_cache(False)
+    interpreted(script)
+    interpreted(script)
+    assert validated() == [True] * MIXED_MACHINES * 2
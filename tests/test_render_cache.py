@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+import interpret.render_cache as render_cache
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    """How many times a cache directory was scanned since the last call."""
+    monkeypatch.setattr(render_cache, "_sizes", {})
+    directories = []
+    evict = render_cache._evict
+
+    def counted_evict(directory, max_bytes):
+        directories.append(directory)
+        return evict(directory, max_bytes)
+
+    monkeypatch.setattr(render_cache, "_evict", counted_evict)
+
+    def count():
+        scanned = len(directories)
+        directories.clear()
+        return scanned
+    return count
+
+
+def stored(directory, key, size, mtime):
+    """Stores a `size` byte image of `key` as render() would, last used
+    at `mtime`, and returns it."""
+    image = directory / (key + ".png")
+    image.write_bytes(b"0" * size)
+    (directory / (key + ".gv")).write_text("digraph {}")
+    os.utime(image, (mtime, mtime))
+    return image
+
+
+def test_directory_is_scanned_once_until_it_may_be_full(tmp_path, scans):
+    render_cache._track(tmp_path, stored(tmp_path, "a", 100, 1), 300)
+    assert scans() == 1
+    render_cache._track(tmp_path, stored(tmp_path, "b", 100, 2), 300)
+    render_cache._track(tmp_path, stored(tmp_path, "c", 100, 3), 300)
+    assert scans() == 0
+    render_cache._track(tmp_path, stored(tmp_path, "d", 100, 4), 300)
+    assert scans() == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "b.gv", "b.png", "c.gv", "c.png", "d.gv", "d.png",
+    ]
+    assert render_cache._sizes[str(tmp_path)] == 300
+
+
+def test_entries_stored_elsewhere_are_counted_at_the_next_scan(tmp_path, scans):
+    render_cache._track(tmp_path, stored(tmp_path, "a", 100, 1), 250)
+    stored(tmp_path, "b", 100, 2)
+    render_cache._track(tmp_path, stored(tmp_path, "c", 100, 3), 250)
+    assert scans() == 1
+    render_cache._track(tmp_path, stored(tmp_path, "d", 100, 4), 250)
+    assert scans() == 1
+    assert sorted(path.name for path in tmp_path.glob("*.png")) == ["c.png", "d.png"]
+    assert render_cache._sizes[str(tmp_path)] == 200